@@ -5,9 +5,11 @@ from q_and_a.query import query_index
 import streamlit as st
 from sentence_transformers import SentenceTransformer
 import pandas as pd
-from sentiment_analysis.predict import predict_single_text
-from summarization.summarizer import summarize_text
+from sentiment_analysis.predict import predict_single_text, cache_stats as sentiment_cache_stats
+from summarization.summarizer import summarize_text, cache_stats as summary_cache_stats
 from sentiment_analysis.report_generator import show_sentiment_report
+from common.resource_manager import resource_manager
+from common.profiling import profile_request
 import hmac
 
 # Load environment variables
@@ -99,10 +101,40 @@ st.markdown("""
 # Initialize constants
 MODELS_DIR = os.path.join(os.path.dirname(__file__), "q_and_a", "FAISS_MODELS")
 
+def show_cache_stats():
+    """Show result cache hit rates in the sidebar"""
+    with st.sidebar.expander("🗄️ Result Cache", expanded=False):
+        for label, stats in (("Sentiment", sentiment_cache_stats()),
+                             ("Summaries", summary_cache_stats())):
+            st.markdown(f"**{label}**")
+            st.write(f"Hit rate: {stats['hit_rate']:.1%} "
+                     f"({stats['memory_hits']} memory, {stats['disk_hits']} disk, {stats['misses']} misses)")
+            st.write(f"Entries: {stats['entries']}/{stats['max_entries']}")
+
+def show_resident_artifacts():
+    """Show the models and indexes currently held in memory in the sidebar"""
+    with st.sidebar.expander("🧠 Resident Models", expanded=False):
+        snapshot = resource_manager.snapshot()
+        budget = f"{snapshot['budget_mb']:.0f} MB" if snapshot['budget_mb'] else "unlimited"
+        st.write(f"Resident: {snapshot['resident_mb']:.1f} MB (budget: {budget})")
+        if snapshot['process_rss_mb'] is not None:
+            st.write(f"Process RSS: {snapshot['process_rss_mb']:.1f} MB")
+        if snapshot['artifacts']:
+            st.dataframe(pd.DataFrame(snapshot['artifacts'])[
+                ['name', 'resident', 'size_mb', 'loads', 'hits', 'evictions']
+            ], use_container_width=True)
+
+def profiling_requested():
+    """Requests are profiled on demand with ?profile=1 in the URL"""
+    return st.query_params.get("profile") == "1"
+
 def main():
     if not check_password():
         st.stop()  # Do not continue if check_password is not True.
         
+    show_cache_stats()
+    show_resident_artifacts()
+    
     # Header with gradient background
     st.markdown("""
         <div style='background: linear-gradient(to right, #1E88E5, #4CAF50); padding: 2rem; border-radius: 10px; margin-bottom: 2rem;'>
@@ -144,10 +176,13 @@ def main():
                 if analyze_button and user_input:
                     with st.spinner("Analyzing sentiment..."):
                         try:
-                            model_path = os.path.join(os.path.dirname(__file__), 
-                                                    "sentiment_analysis", 
-                                                    "xgboost_all-MiniLM-L6-v2.pkl")
-                            sentiment, confidence = predict_single_text(user_input, model_path)
+                            model_path = os.environ.get("SENTIMENT_MODEL_PATH") or \
+                                os.path.join(os.path.dirname(__file__), 
+                                             "sentiment_analysis", 
+                                             "xgboost_all-MiniLM-L6-v2.pkl")
+                            with profile_request("sentiment", force=profiling_requested(),
+                                                 text_length=len(user_input), model=os.path.basename(model_path)):
+                                sentiment, confidence = predict_single_text(user_input, model_path)
                             
                             # Results in a nice card
                             st.markdown(f"""
@@ -233,7 +268,9 @@ def main():
             if st.button("📝 Generate Summary", use_container_width=True):
                 if user_input:
                     with st.spinner("Generating summary..."):
-                        summary = summarize_text(user_input, num_sentences=num_sentences)
+                        with profile_request("summary", force=profiling_requested(),
+                                             text_length=len(user_input), num_sentences=num_sentences):
+                            summary = summarize_text(user_input, num_sentences=num_sentences)
                         st.success("Summary Generated!")
                         
                         # Display summary in a card
@@ -311,8 +348,17 @@ def main():
                     if submit_button and query:
                         with st.spinner("Processing query..."):
                             try:
-                                index, chunks = load_faiss_data(chunk_size, overlap_size)
-                                response_data = query_index(query, index, chunks)
+                                # Rebuilding the index changes its size/mtime, which reloads it
+                                index_stat = os.stat(os.path.join(MODELS_DIR, idx))
+                                index, chunks = resource_manager.get(
+                                    ('faiss', chunk_size, overlap_size),
+                                    lambda: load_faiss_data(chunk_size, overlap_size),
+                                    name=f"FAISS index + chunks ({chunk_size}/{overlap_size})",
+                                    version=(index_stat.st_size, index_stat.st_mtime_ns))
+                                with profile_request("qa", force=profiling_requested(),
+                                                     query_length=len(query), chunk_size=chunk_size,
+                                                     overlap_size=overlap_size):
+                                    response_data = query_index(query, index, chunks)
                                 
                                 # Display response in a card
                                 st.markdown(f"""
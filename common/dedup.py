@@ -0,0 +1,222 @@
+import re
+import time
+import zlib
+from typing import List, Optional
+import numpy as np
+
+# Collapses repeated messages before they reach SentenceTransformer.encode and
+# fans the shared embedding back out to every row. Exact mode merges texts
+# that differ only in case and whitespace, which all-MiniLM-L6-v2 (an uncased
+# model) embeds identically. Near mode additionally merges texts whose
+# character-shingle Jaccard similarity is above a threshold, found with
+# MinHash signatures and LSH banding.
+
+DEDUP_MODES = ("none", "exact", "near")
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_ALNUM_RE = re.compile(r'[^\w\s]|_')
+
+# Mersenne prime used by the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return _WHITESPACE_RE.sub(' ', str(text)).strip().lower()
+
+
+def _strip_punctuation(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', _NON_ALNUM_RE.sub('', text)).strip()
+
+
+def _shingles(text: str, size: int) -> np.ndarray:
+    """Hashed character shingles of the punctuation-stripped text"""
+    stripped = _strip_punctuation(text)
+    if len(stripped) <= size:
+        grams = {stripped}
+    else:
+        grams = {stripped[i:i + size] for i in range(len(stripped) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHashLSH:
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, seed: int = 42):
+        """
+        MinHash signatures with banded locality-sensitive hashing
+
+        Args:
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands (num_perm must be divisible by it)
+            shingle_size: Character n-gram length
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text"""
+        hashes = _shingles(text, self.shingle_size)
+        # uint64 arithmetic wraps, which is fine for hashing purposes
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+    def clusters(self, texts: List[str], threshold: float) -> np.ndarray:
+        """
+        Group near-duplicate texts
+
+        Texts with fewer than shingle_size characters left after stripping
+        punctuation (e.g. ":)" or "?") are never merged, since their shingles
+        would no longer tell them apart.
+
+        Args:
+            texts: Texts to group
+            threshold: Minimum estimated Jaccard similarity to merge two texts
+
+        Returns:
+            np.ndarray: Index of the representative text for every input text
+        """
+        signatures = np.array([self.signature(t) for t in texts]) if texts else np.empty((0, self.num_perm))
+        parent = np.arange(len(texts))
+        comparable = [len(_strip_punctuation(t)) >= self.shingle_size for t in texts]
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets = {}
+            for i, key in enumerate(map(bytes, columns)):
+                if not comparable[i]:
+                    continue
+                first = buckets.setdefault(key, i)
+                if first == i:
+                    continue
+                root_i, root_first = find(i), find(first)
+                if root_i == root_first:
+                    continue
+                similarity = np.mean(signatures[i] == signatures[first])
+                if similarity >= threshold:
+                    # Keep the earliest text as the representative
+                    parent[max(root_i, root_first)] = min(root_i, root_first)
+
+        return np.array([find(i) for i in range(len(texts))], dtype=np.int64)
+
+
+class DedupResult:
+    def __init__(self, unique_texts: List[str], inverse: np.ndarray, exact_unique: int):
+        """
+        Outcome of deduplicating a list of texts
+
+        Args:
+            unique_texts: Texts that need to be encoded
+            inverse: For every input row, the index of its text in unique_texts
+            exact_unique: Number of distinct texts after exact deduplication
+        """
+        self.unique_texts = unique_texts
+        self.inverse = inverse
+        self.exact_unique = exact_unique
+
+    def expand(self, embeddings: np.ndarray) -> np.ndarray:
+        """Fan embeddings of the unique texts back out to every input row"""
+        return np.asarray(embeddings)[self.inverse]
+
+    def report(self) -> dict:
+        rows = len(self.inverse)
+        unique = len(self.unique_texts)
+        return {
+            "rows": rows,
+            "exact_unique": self.exact_unique,
+            "encoded": unique,
+            "encodes_saved": rows - unique,
+            "saved_fraction": (rows - unique) / rows if rows else 0.0,
+        }
+
+
+def deduplicate(texts: List[str], mode: str = "exact", threshold: float = 0.9,
+                lsh: Optional[MinHashLSH] = None) -> DedupResult:
+    """
+    Collapse repeated texts ahead of encoding
+
+    Args:
+        texts: Input texts, one per row
+        mode: "none", "exact" or "near"
+        threshold: Jaccard similarity needed to merge texts in near mode
+        lsh: Optional MinHashLSH instance to use in near mode
+
+    Returns:
+        DedupResult: Texts to encode and the row-to-text mapping
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}', expected one of {DEDUP_MODES}")
+
+    texts = [str(t) for t in texts]
+    if mode == "none":
+        return DedupResult(texts, np.arange(len(texts)), len(texts))
+
+    first_seen = {}
+    unique_texts = []
+    inverse = np.empty(len(texts), dtype=np.int64)
+    for row, text in enumerate(texts):
+        key = normalize_text(text)
+        index = first_seen.get(key)
+        if index is None:
+            index = first_seen[key] = len(unique_texts)
+            unique_texts.append(text)
+        inverse[row] = index
+    exact_unique = len(unique_texts)
+
+    if mode == "near" and unique_texts:
+        lsh = lsh or MinHashLSH()
+        representatives = lsh.clusters([normalize_text(t) for t in unique_texts], threshold)
+        kept, remap = np.unique(representatives, return_inverse=True)
+        unique_texts = [unique_texts[i] for i in kept]
+        inverse = remap[inverse]
+
+    return DedupResult(unique_texts, inverse, exact_unique)
+
+
+def encode_deduplicated(encoder, texts: List[str], mode: str = "exact", threshold: float = 0.9,
+                        **encode_kwargs) -> tuple:
+    """
+    Encode texts once per (near-)duplicate group and fan the embeddings out
+
+    Args:
+        encoder: Object with an encode(list_of_texts, **kwargs) method, e.g. SentenceTransformer
+        texts: Input texts, one per row
+        mode: "none", "exact" or "near"
+        threshold: Jaccard similarity needed to merge texts in near mode
+        **encode_kwargs: Passed through to encoder.encode
+
+    Returns:
+        tuple: (embeddings with one row per input text, report dict)
+    """
+    start = time.perf_counter()
+    result = deduplicate(texts, mode, threshold)
+    dedup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    embeddings = encoder.encode(result.unique_texts, **encode_kwargs)
+    encode_seconds = time.perf_counter() - start
+
+    report = result.report()
+    report.update({"mode": mode, "dedup_seconds": dedup_seconds, "encode_seconds": encode_seconds})
+    return result.expand(embeddings), report
+
+
+def format_report(report: dict) -> str:
+    """One-line summary of how much encoder work deduplication saved"""
+    return (f"Dedup ({report['mode']}): {report['rows']} rows -> {report['encoded']} encoded "
+            f"({report['exact_unique']} exact-unique), saved {report['encodes_saved']} encodes "
+            f"({report['saved_fraction']:.1%}); dedup {report['dedup_seconds']:.2f}s, "
+            f"encode {report['encode_seconds']:.2f}s")
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Opt-in stack-sampling profiler for individual requests. A profiled request
+# is sampled from a background thread and written in the folded-stack format
+# read by flamegraph.pl, speedscope and inferno, with a JSON sidecar holding
+# the request metadata.
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_PROFILES = int(os.environ.get("PROFILE_MAX_PROFILES", "200"))
+PROFILE_MAX_MB = float(os.environ.get("PROFILE_MAX_MB", "100"))
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Periodically record the call stack of one thread
+
+        Args:
+            thread_id: Identifier of the thread to sample (threading.get_ident())
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _folded(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._folded(frame)] += 1
+                self.samples += 1
+            del frame
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _enforce_retention(directory: str, max_profiles: int, max_mb: float):
+    """Delete the oldest profiles until the directory is within its limits"""
+    try:
+        names = {os.path.splitext(n)[0] for n in os.listdir(directory) if n.endswith(('.folded', '.json'))}
+    except OSError:
+        return
+
+    profiles = []
+    for name in names:
+        paths = [os.path.join(directory, name + ext) for ext in ('.folded', '.json')]
+        existing = [p for p in paths if os.path.exists(p)]
+        if existing:
+            profiles.append((min(os.path.getmtime(p) for p in existing),
+                             sum(os.path.getsize(p) for p in existing), existing))
+    profiles.sort()
+
+    total = sum(size for _, size, _ in profiles)
+    while profiles and (len(profiles) > max_profiles or total > max_mb * 1024 * 1024):
+        _, size, paths = profiles.pop(0)
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+
+def should_profile(force: bool = False) -> bool:
+    """Whether to profile this request, either explicitly or by sampling rate"""
+    return force or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE)
+
+
+@contextmanager
+def profile_request(name: str, force: bool = False, **metadata):
+    """
+    Profile the enclosed block if requested or sampled
+
+    Args:
+        name: Request type, e.g. "sentiment", "summary" or "qa"
+        force: Profile regardless of PROFILE_SAMPLE_RATE
+        **metadata: Extra request details stored with the profile (avoid raw user text)
+
+    Yields:
+        None
+    """
+    if not should_profile(force):
+        yield
+        return
+
+    sampler = StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000)
+    started_at = time.time()
+    start = time.perf_counter()
+    error = None
+    sampler.start()
+    try:
+        yield
+    except Exception as e:
+        error = repr(e)
+        raise
+    finally:
+        sampler.stop()
+        duration = time.perf_counter() - start
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profile_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))}_{name}_{uuid.uuid4().hex[:8]}"
+            base = os.path.join(PROFILE_DIR, profile_id)
+            with open(base + '.folded', 'w') as f:
+                for stack, count in sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            with open(base + '.json', 'w') as f:
+                json.dump({
+                    "id": profile_id,
+                    "request": name,
+                    "started_at": started_at,
+                    "duration_s": duration,
+                    "interval_ms": PROFILE_INTERVAL_MS,
+                    "samples": sampler.samples,
+                    "forced": force,
+                    "error": error,
+                    "metadata": metadata,
+                }, f, indent=4, default=str)
+            _enforce_retention(PROFILE_DIR, PROFILE_MAX_PROFILES, PROFILE_MAX_MB)
+        except Exception as e:
+            print(f"Error writing profile: {str(e)}")
@@ -0,0 +1,211 @@
+import gc
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Process memory budget for loaded artifacts, 0 disables eviction
+MEMORY_BUDGET_MB = float(os.environ.get("MEMORY_BUDGET_MB", "0"))
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process from /proc, or None where unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Rough in-memory size of common artifact types
+
+    Args:
+        value: Loaded artifact (NumPy array, torch module, FAISS index, container, ...)
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if hasattr(value, 'parameters'):
+        try:
+            return sum(p.numel() * p.element_size() for p in value.parameters())
+        except Exception:
+            pass
+    if hasattr(value, 'ntotal') and hasattr(value, 'd'):
+        return int(value.ntotal) * int(value.d) * 4
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.value = None
+        self.size = 0
+        self.resident = False
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.last_used = 0.0
+        self.load_seconds = 0.0
+        self.lock = threading.Lock()
+
+
+class ResourceManager:
+    def __init__(self, budget_mb: float = MEMORY_BUDGET_MB):
+        """
+        Registry of loaded artifacts kept within a memory budget
+
+        Artifacts are loaded on first use, sized when loaded, and evicted least
+        recently used first once their combined size exceeds the budget. An
+        evicted artifact is reloaded by its loader the next time it is requested
+        and keeps the size measured when it was first loaded.
+
+        Eviction only drops the registry's reference. A request still using an
+        evicted artifact keeps it alive, and if the artifact is reloaded meanwhile
+        both copies are resident, so process memory can briefly exceed the budget.
+
+        Args:
+            budget_mb: Combined size limit in MB for resident artifacts (0 = unlimited)
+        """
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any], name: Optional[str] = None,
+            size_fn: Optional[Callable[[Any], int]] = None, version: Optional[Hashable] = None) -> Any:
+        """
+        Return a resident artifact, loading it (and evicting others) if needed
+
+        Args:
+            key: Identity of the artifact, including anything that changes its contents
+            loader: Zero-argument callable that loads the artifact
+            name: Label shown in the introspection view (defaults to str(key))
+            version: Optional identity of the artifact's contents (e.g. file size and
+                     mtime); registered versions of key other than this one are dropped
+            size_fn: Optional callable returning the artifact size in bytes. Without
+                     it the size is estimated from the object and, on the first load
+                     only, the growth of the process RSS (which can include memory
+                     allocated by other threads at the same time)
+
+        Returns:
+            The loaded artifact
+        """
+        if version is not None:
+            base, key = key, (key, version)
+        with self._lock:
+            if version is not None:
+                for stale in [k for k in self._entries
+                              if isinstance(k, tuple) and len(k) == 2 and k[0] == base and k[1] != version]:
+                    # Contents changed on disk, so the old copy will never be requested again
+                    del self._entries[stale]
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(name or str(key), loader)
+            entry.loader = loader
+
+        with entry.lock:
+            with self._lock:
+                # Eviction clears entry.value under self._lock, so read it under the same lock
+                if entry.resident:
+                    entry.hits += 1
+                    entry.last_used = time.time()
+                    self._entries.move_to_end(key)
+                    return entry.value
+
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            value = loader()
+            load_seconds = time.perf_counter() - start
+            rss_after = current_rss_bytes()
+
+            if size_fn is not None:
+                size = int(size_fn(value))
+            else:
+                size = estimate_size(value)
+                if entry.loads == 0 and rss_before is not None and rss_after is not None:
+                    size = max(size, rss_after - rss_before)
+                # A reload reuses the pages freed by the eviction, so RSS barely moves
+                # and the estimate alone may miss native memory; keep the first measurement
+                size = max(size, entry.size)
+
+            with self._lock:
+                entry.value = value
+                entry.size = size
+                entry.resident = True
+                entry.loads += 1
+                entry.load_seconds = load_seconds
+                entry.last_used = time.time()
+                self._entries.move_to_end(key)
+                self._enforce_budget(keep=key)
+            return value
+
+    def _enforce_budget(self, keep: Hashable):
+        """Evict least recently used artifacts until the resident total fits the budget"""
+        if not self.budget_bytes:
+            return
+        freed = False
+        for key, entry in list(self._entries.items()):
+            if self.resident_bytes() <= self.budget_bytes:
+                break
+            if key == keep or not entry.resident:
+                continue
+            print(f"Memory budget exceeded, evicting {entry.name} ({entry.size / 1024 / 1024:.1f} MB)")
+            entry.value = None
+            entry.resident = False
+            entry.evictions += 1
+            freed = True
+        if freed:
+            gc.collect()
+
+    def evict(self, key: Hashable):
+        """Drop an artifact; it is reloaded on its next use"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.resident:
+                entry.value = None
+                entry.resident = False
+                entry.evictions += 1
+        gc.collect()
+
+    def resident_bytes(self) -> int:
+        return sum(entry.size for entry in self._entries.values() if entry.resident)
+
+    def snapshot(self) -> dict:
+        """
+        Introspection view of the registry
+
+        Returns:
+            dict: Budget, resident total, process RSS and per-artifact details,
+                  most recently used first
+        """
+        with self._lock:
+            artifacts = [{
+                "name": entry.name,
+                "resident": entry.resident,
+                "size_mb": entry.size / 1024 / 1024,
+                "loads": entry.loads,
+                "hits": entry.hits,
+                "evictions": entry.evictions,
+                "load_seconds": entry.load_seconds,
+                "last_used": entry.last_used,
+            } for entry in reversed(self._entries.values())]
+            rss = current_rss_bytes()
+            return {
+                "budget_mb": self.budget_bytes / 1024 / 1024,
+                "resident_mb": self.resident_bytes() / 1024 / 1024,
+                "process_rss_mb": rss / 1024 / 1024 if rss is not None else None,
+                "artifacts": artifacts,
+            }
+
+
+resource_manager = ResourceManager()
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+# Cache configuration, overridable through the environment
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "")
+# Bounds of the on-disk tier: model versions unused for this long are removed,
+# then the least recently used entries until the tier fits in the size limit
+RESULT_CACHE_MAX_AGE_DAYS = float(os.environ.get("RESULT_CACHE_MAX_AGE_DAYS", "7"))
+RESULT_CACHE_MAX_DISK_MB = float(os.environ.get("RESULT_CACHE_MAX_DISK_MB", "500"))
+
+# Disk writes between two pruning passes
+_PRUNE_EVERY = 1000
+
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    Content hash of a file, recomputed only when its size or mtime changes
+
+    Args:
+        path: Path to the file (e.g. a model pickle)
+
+    Returns:
+        str: Hex digest identifying the current file contents
+    """
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+
+    with _fingerprint_lock:
+        cached = _fingerprints.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    fingerprint = digest.hexdigest()[:16]
+
+    with _fingerprint_lock:
+        _fingerprints[path] = (stamp, fingerprint)
+    return fingerprint
+
+
+class ResultCache:
+    def __init__(self, namespace: str, max_entries: int = RESULT_CACHE_SIZE,
+                 disk_dir: Optional[str] = RESULT_CACHE_DIR,
+                 max_age_days: float = RESULT_CACHE_MAX_AGE_DAYS,
+                 max_disk_mb: float = RESULT_CACHE_MAX_DISK_MB):
+        """
+        Two-tier result cache keyed by content hash and model version
+
+        Results of several model versions can be cached side by side; versions
+        that are retired are removed with discard_version(). The disk tier is
+        also pruned on startup and periodically while writing, since versions
+        retired while no process was running are never discarded explicitly.
+
+        Args:
+            namespace: Name separating this cache from others sharing disk_dir
+            max_entries: Capacity of the in-memory LRU tier
+            disk_dir: Optional directory for the persistent tier (disabled if empty)
+            max_age_days: Remove disk entries of versions unused for this long (0 = never)
+            max_disk_mb: Size limit of the disk tier (0 = unlimited)
+        """
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = os.path.join(disk_dir, namespace) if disk_dir else None
+        self.max_age_days = max_age_days
+        self.max_disk_mb = max_disk_mb
+        self._disk_writes = 0
+
+        # key -> (version, value), so one version can be dropped without the others
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            self.prune_disk()
+
+    @staticmethod
+    def make_key(text: str, version: str, **params) -> str:
+        """Hash the input text together with the model version and parameters"""
+        digest = hashlib.sha256()
+        digest.update(version.encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str, version: str) -> str:
+        return os.path.join(self.disk_dir, version, key[:2], key + '.pkl')
+
+    def _read_disk(self, key: str, version: str):
+        path = self._disk_path(key, version)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            # Refresh the mtime, which pruning uses as the last time the entry was used
+            os.utime(path)
+            return True, value
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {path}: {str(e)}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False, None
+
+    def _write_disk(self, key: str, version: str, value: Any):
+        path = self._disk_path(key, version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing cache entry: {str(e)}")
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % _PRUNE_EVERY == 0:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """
+        Enforce the age and size limits of the disk tier
+
+        A version directory is removed once its most recently used entry is older
+        than max_age_days. The least recently used entries are then removed until
+        the tier is within max_disk_mb.
+        """
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return
+        now = time.time()
+        entries = []
+        try:
+            for version in os.listdir(self.disk_dir):
+                version_dir = os.path.join(self.disk_dir, version)
+                files = []
+                for root, _, names in os.walk(version_dir):
+                    for name in names:
+                        path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        files.append((stat.st_mtime, stat.st_size, path))
+
+                last_used = max((mtime for mtime, _, _ in files), default=os.path.getmtime(version_dir))
+                if self.max_age_days and now - last_used > self.max_age_days * 86400:
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                else:
+                    entries.extend(files)
+        except OSError as e:
+            print(f"Error pruning cache directory: {str(e)}")
+            return
+
+        if not self.max_disk_mb:
+            return
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_disk_mb * 1024 * 1024
+        while entries and total > limit:
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def _remember(self, key: str, version: str, value: Any):
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, text: str, version: str, compute: Callable[[], Any],
+                       cacheable: Callable[[Any], bool] = lambda value: True, **params) -> Any:
+        """
+        Return the cached result for text, computing and storing it on a miss
+
+        Args:
+            text: Input text the result was derived from
+            version: Model version the result depends on
+            compute: Zero-argument callable producing the result
+            cacheable: Predicate deciding whether a computed result may be stored
+            **params: Extra arguments that change the result (e.g. num_sentences)
+
+        Returns:
+            The cached or freshly computed result
+        """
+        key = self.make_key(text, version, **params)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key][1]
+
+            if self.disk_dir:
+                found, value = self._read_disk(key, version)
+                if found:
+                    self._remember(key, version, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+
+        value = compute()
+        if not cacheable(value):
+            return value
+
+        with self._lock:
+            self._remember(key, version, value)
+            if self.disk_dir:
+                self._write_disk(key, version, value)
+        return value
+
+    def discard_version(self, version: str):
+        """
+        Drop the entries of a model version that is no longer served
+
+        Other versions are untouched, so processes or callers using different
+        models can share one cache.
+
+        Args:
+            version: Model version whose results should be removed from both tiers
+        """
+        with self._lock:
+            for key in [k for k, (v, _) in self._entries.items() if v == version]:
+                del self._entries[key]
+            if self.disk_dir:
+                shutil.rmtree(os.path.join(self.disk_dir, version), ignore_errors=True)
+
+    def clear(self):
+        """Empty both tiers and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            if self.disk_dir:
+                shutil.rmtree(self.disk_dir, ignore_errors=True)
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Report cache usage
+
+        Returns:
+            dict: Entry count, hit/miss counters and overall hit rate
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "namespace": self.namespace,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0
+            }
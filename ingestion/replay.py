@@ -0,0 +1,45 @@
+import os
+import json
+import time
+import argparse
+import pandas as pd
+
+# Replays dataset messages into the ingestion inbox at a fixed rate, standing
+# in for a live producer:
+#   python -m ingestion.replay --input-file assignment_details/sample_topical_chat.csv --rate 20
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Append dataset messages to the ingestion inbox")
+    parser.add_argument('--input-file', default=os.path.join('assignment_details', 'sample_topical_chat.csv'))
+    parser.add_argument('--inbox', default=os.path.join('ingestion', 'inbox.jsonl'))
+    parser.add_argument('--rate', type=float, default=20.0, help="Messages per second (0 = as fast as possible)")
+    parser.add_argument('--limit', type=int, default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = pd.read_csv(args.input_file, nrows=args.limit)
+    os.makedirs(os.path.dirname(args.inbox) or '.', exist_ok=True)
+
+    interval = 1.0 / args.rate if args.rate else 0.0
+    next_send = time.monotonic()
+    with open(args.inbox, 'a', encoding='utf-8') as f:
+        for i, row in enumerate(df.itertuples(index=False)):
+            f.write(json.dumps({
+                "conversation_id": str(row.conversation_id),
+                "message": str(row.message),
+                "timestamp": time.time(),
+            }) + '\n')
+            f.flush()
+            if interval:
+                next_send += interval
+                time.sleep(max(0.0, next_send - time.monotonic()))
+            if (i + 1) % 100 == 0:
+                print(f"Sent {i + 1} messages")
+    print(f"Replayed {len(df)} messages into {args.inbox}")
+
+
+if __name__ == "__main__":
+    main()
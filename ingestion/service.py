@@ -0,0 +1,320 @@
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import numpy as np
+import pandas as pd
+from ingestion.sources import FileTailSource
+from sentiment_analysis.predict import SentimentPredictor
+from summarization.main import summarize_text
+
+# Streams conversation messages from a local queue through sentiment scoring
+# in micro-batches, refreshes the summaries of the conversations each batch
+# touched and hands the new messages to an optional Q&A index sink.
+#   python -m ingestion.service --inbox ingestion/inbox.jsonl
+# Producers append one JSON object per line:
+#   {"conversation_id": 1, "message": "...", "timestamp": <unix seconds>}
+
+OUTPUT_DIR = os.path.join("ingestion", "output")
+SUMMARIES_PATH = os.path.join("summarization", "text_summaries.txt")
+
+_SUMMARY_BLOCK_RE = re.compile(r'^Conversation (\S+):\n(.*?)(?:\n\n|\Z)', re.S | re.M)
+
+
+class LagMetrics:
+    def __init__(self, window: int = 10000):
+        """
+        End-to-end lag and throughput of the ingestion pipeline
+
+        Args:
+            window: Number of most recent message lags used for percentiles
+        """
+        self.window = window
+        self._lags = []
+        self.messages = 0
+        self.batches = 0
+        self.started = time.time()
+        self.last_batch = {}
+        self._lock = threading.Lock()
+
+    def record_batch(self, lags: List[float], stage_seconds: dict):
+        with self._lock:
+            self._lags.extend(lags)
+            if len(self._lags) > self.window:
+                self._lags = self._lags[-self.window:]
+            self.messages += len(lags)
+            self.batches += 1
+            self.last_batch = {"size": len(lags), **stage_seconds}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.time() - self.started
+            lags = np.array(self._lags) if self._lags else None
+            return {
+                "messages": self.messages,
+                "batches": self.batches,
+                "throughput_mps": self.messages / elapsed if elapsed else 0.0,
+                "lag_p50_s": float(np.percentile(lags, 50)) if lags is not None else None,
+                "lag_p95_s": float(np.percentile(lags, 95)) if lags is not None else None,
+                "lag_p99_s": float(np.percentile(lags, 99)) if lags is not None else None,
+                "lag_max_s": float(lags.max()) if lags is not None else None,
+                "last_batch": dict(self.last_batch),
+            }
+
+
+class IngestionService:
+    def __init__(self, source, model_path: Optional[str] = None, output_dir: str = OUTPUT_DIR,
+                 summaries_path: str = SUMMARIES_PATH, batch_size: int = 64, max_wait: float = 0.5,
+                 num_sentences: int = 3, index_sink: Optional[Callable[[dict], None]] = None,
+                 seed_csv: Optional[str] = None, summary_flush_interval: float = 5.0):
+        """
+        Micro-batching consumer for newly arriving conversation messages
+
+        Args:
+            source: Object with poll(max_messages, timeout) and commit() methods
+            model_path: Sentiment model to score with (default model if None)
+            output_dir: Directory for scored messages and lag metrics
+            summaries_path: Summary file kept up to date for touched conversations
+            batch_size: Maximum messages per micro-batch
+            max_wait: Seconds to wait for a batch to fill before processing it
+            num_sentences: Sentences per refreshed summary
+            index_sink: Optional callable receiving {conversation_id: [new messages]}
+                        for each batch, to extend the Q&A index
+            seed_csv: Optional CSV of earlier messages, so refreshed summaries cover
+                      whole conversations rather than only newly ingested messages
+            summary_flush_interval: Minimum seconds between rewrites of the summary file.
+                      Summaries are refreshed in memory every batch, but the file holds
+                      every conversation, so each rewrite costs O(all conversations)
+        """
+        self.source = source
+        self.predictor = SentimentPredictor(model_path)
+        self.output_dir = output_dir
+        self.summaries_path = summaries_path
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.num_sentences = num_sentences
+        self.index_sink = index_sink
+        self.summary_flush_interval = summary_flush_interval
+        self.metrics = LagMetrics()
+        self._stop = threading.Event()
+        self._summaries_dirty = False
+        self._last_flush = time.monotonic()
+        self._last_source_offset = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.scored_path = os.path.join(output_dir, 'scored_messages.jsonl')
+        self.metrics_path = os.path.join(output_dir, 'metrics.json')
+        self.summaries = self._load_summaries()
+        self.conversations, stale = self._load_history(seed_csv)
+        self._recover(stale)
+
+    def _load_history(self, seed_csv: Optional[str] = None) -> tuple:
+        """
+        Rebuild conversation transcripts from the seed CSV and previously scored messages
+
+        Returns:
+            tuple: (conversations, ids of conversations scored after the summary file was written)
+        """
+        summaries_mtime = os.path.getmtime(self.summaries_path) if os.path.exists(self.summaries_path) else 0.0
+        conversations = OrderedDict()
+        stale = OrderedDict()
+        if seed_csv:
+            df = pd.read_csv(seed_csv, usecols=['conversation_id', 'message'])
+            for conversation_id, group in df.groupby('conversation_id', sort=False):
+                conversations[str(conversation_id)] = group['message'].dropna().astype(str).tolist()
+        if os.path.exists(self.scored_path):
+            with open(self.scored_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    conversation_id = str(record['conversation_id'])
+                    conversations.setdefault(conversation_id, []).append(record['message'])
+                    if record.get('source_offset') is not None:
+                        self._last_source_offset = record['source_offset']
+                    if (record.get('processed_at') or 0.0) > summaries_mtime:
+                        stale[conversation_id] = True
+        return conversations, list(stale)
+
+    def _recover(self, stale: List[str]):
+        """Catch up after a restart, including one between writing a batch and committing it"""
+        # Messages already in scored_messages.jsonl are not processed again
+        if self._last_source_offset and hasattr(self.source, 'seek'):
+            if self.source.seek(self._last_source_offset):
+                print(f"Skipped messages scored before the last offset commit (offset {self._last_source_offset})")
+
+        # Summaries not flushed before the restart are rebuilt from the transcripts
+        if stale:
+            for conversation_id in stale:
+                self.summaries[conversation_id] = summarize_text(
+                    ' '.join(self.conversations[conversation_id]), self.num_sentences)
+            self._write_summaries()
+            print(f"Refreshed {len(stale)} summaries not written before the last stop")
+
+    def _load_summaries(self) -> OrderedDict:
+        summaries = OrderedDict()
+        if os.path.exists(self.summaries_path):
+            with open(self.summaries_path, encoding='utf-8') as f:
+                for match in _SUMMARY_BLOCK_RE.finditer(f.read()):
+                    summaries[match.group(1)] = match.group(2)
+        return summaries
+
+    def _write_summaries(self):
+        tmp_path = self.summaries_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for conversation_id, summary in self.summaries.items():
+                f.write(f"Conversation {conversation_id}:\n{summary}\n\n")
+        os.replace(tmp_path, self.summaries_path)
+        self._summaries_dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush_summaries(self, force: bool = False):
+        """Rewrite the summary file if it changed and the flush interval has passed"""
+        if self._summaries_dirty and (force or time.monotonic() - self._last_flush >= self.summary_flush_interval):
+            self._write_summaries()
+
+    def process_batch(self, messages: List[dict]):
+        """
+        Score, summarize and index one micro-batch
+
+        Args:
+            messages: Dicts with conversation_id, message and optional timestamp
+        """
+        received = time.time()
+        messages = [m for m in messages if m.get('message') is not None and m.get('conversation_id') is not None]
+        if not messages:
+            return
+        stages = {}
+
+        start = time.perf_counter()
+        results = self.predictor.predict_batch([str(m['message']) for m in messages])
+        stages["sentiment_s"] = time.perf_counter() - start
+        if all(sentiment == "Error" for sentiment, _ in results):
+            # predict_batch reports failures per message; a fully failed batch means the
+            # model is unusable, so fail the batch rather than persist and commit it
+            raise RuntimeError("Sentiment prediction failed for the whole batch")
+        if self.predictor.last_dedup_report:
+            stages["encodes_saved"] = self.predictor.last_dedup_report["encodes_saved"]
+
+        touched = OrderedDict()
+        lines = []
+        for message, (sentiment, confidence) in zip(messages, results):
+            conversation_id = str(message['conversation_id'])
+            text = str(message['message'])
+            touched.setdefault(conversation_id, []).append(text)
+            lines.append(json.dumps({
+                "conversation_id": conversation_id,
+                "message": text,
+                "sentiment": sentiment,
+                "confidence": float(confidence),
+                "timestamp": message.get('timestamp'),
+                "processed_at": time.time(),
+                # Lets a restart skip this message if the source offset was not committed
+                "source_offset": message.get('source_offset'),
+            }) + '\n')
+        # One write per batch, so a crash leaves at most a partial last line (skipped on load)
+        with open(self.scored_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+        for conversation_id, texts in touched.items():
+            self.conversations.setdefault(conversation_id, []).extend(texts)
+
+        # Only conversations that received messages need a new summary
+        start = time.perf_counter()
+        for conversation_id in touched:
+            transcript = ' '.join(self.conversations[conversation_id])
+            self.summaries[conversation_id] = summarize_text(transcript, self.num_sentences)
+        self._summaries_dirty = True
+        self.flush_summaries()
+        stages["summaries_s"] = time.perf_counter() - start
+        stages["conversations"] = len(touched)
+
+        if self.index_sink is not None:
+            start = time.perf_counter()
+            try:
+                self.index_sink(dict(touched))
+            except Exception as e:
+                print(f"Error adding messages to the Q&A index: {str(e)}")
+            stages["index_s"] = time.perf_counter() - start
+
+        done = time.time()
+        lags = [done - float(m.get('timestamp') or received) for m in messages]
+        self.metrics.record_batch(lags, stages)
+
+    def write_metrics(self):
+        with open(self.metrics_path, 'w') as f:
+            json.dump(self.metrics.snapshot(), f, indent=4)
+
+    def run(self, metrics_interval: float = 10.0):
+        """Consume messages until stop() is called"""
+        print("Ingestion service started")
+        last_report = time.monotonic()
+        while not self._stop.is_set():
+            messages = self.source.poll(self.batch_size, self.max_wait)
+            if messages:
+                try:
+                    self.process_batch(messages)
+                    self.source.commit()
+                except Exception as e:
+                    print(f"Error processing batch: {str(e)}")
+                    self.flush_summaries(force=True)
+                    raise
+            self.flush_summaries()
+
+            if time.monotonic() - last_report >= metrics_interval:
+                last_report = time.monotonic()
+                self.write_metrics()
+                snapshot = self.metrics.snapshot()
+                if snapshot["lag_p95_s"] is not None:
+                    print(f"{snapshot['messages']} messages, {snapshot['throughput_mps']:.1f} msg/s, "
+                          f"lag p50 {snapshot['lag_p50_s']:.2f}s p95 {snapshot['lag_p95_s']:.2f}s")
+        self.flush_summaries(force=True)
+        self.write_metrics()
+
+    def start(self) -> threading.Thread:
+        """Run the service in a background thread"""
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Streaming ingestion of conversation messages")
+    parser.add_argument('--inbox', default=os.path.join('ingestion', 'inbox.jsonl'),
+                        help="JSON Lines file producers append messages to")
+    parser.add_argument('--model-path', default=os.environ.get("SENTIMENT_MODEL_PATH"))
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--summaries-path', default=SUMMARIES_PATH)
+    parser.add_argument('--seed-csv', default=None,
+                        help="CSV of messages processed before streaming started (e.g. the batch dataset)")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=500)
+    parser.add_argument('--metrics-interval', type=float, default=10.0)
+    parser.add_argument('--summary-flush-interval', type=float, default=5.0,
+                        help="Minimum seconds between rewrites of the summary file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    service = IngestionService(FileTailSource(args.inbox), args.model_path, args.output_dir,
+                               args.summaries_path, args.batch_size, args.max_wait_ms / 1000,
+                               seed_csv=args.seed_csv, summary_flush_interval=args.summary_flush_interval)
+    try:
+        service.run(args.metrics_interval)
+    except KeyboardInterrupt:
+        service.stop()
+        service.flush_summaries(force=True)
+        service.write_metrics()
+        print("Ingestion service stopped")
+
+
+if __name__ == "__main__":
+    main()
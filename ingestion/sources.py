@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import queue
+from typing import List, Optional
+
+
+class InProcessSource:
+    def __init__(self, maxsize: int = 0):
+        """
+        In-process stand-in for a message broker
+
+        Args:
+            maxsize: Queue capacity (0 = unbounded)
+        """
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def publish(self, message: dict):
+        """Enqueue a message, stamping its enqueue time if it has none"""
+        message.setdefault("timestamp", time.time())
+        self._queue.put(message)
+
+    def poll(self, max_messages: int, timeout: float) -> List[dict]:
+        """
+        Collect up to max_messages, waiting at most timeout seconds for the first
+
+        Returns:
+            list: Messages in arrival order
+        """
+        messages = []
+        deadline = time.monotonic() + timeout
+        while len(messages) < max_messages:
+            remaining = deadline - time.monotonic()
+            try:
+                if messages or remaining <= 0:
+                    messages.append(self._queue.get_nowait())
+                else:
+                    messages.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return messages
+
+    def commit(self):
+        """Messages are acknowledged as soon as they are polled"""
+
+
+class FileTailSource:
+    def __init__(self, path: str, offset_path: Optional[str] = None):
+        """
+        Tail a JSON Lines file that producers append messages to
+
+        The read offset is persisted after each processed batch, so a restarted
+        service resumes where it left off. Each message carries the offset just
+        past its line as "source_offset", so a consumer that stores it with its
+        output can seek() past a batch it processed but did not commit.
+
+        Args:
+            path: File of one JSON message per line
+            offset_path: Where to persist the committed offset (default: path + '.offset')
+        """
+        self.path = path
+        self.offset_path = offset_path or path + '.offset'
+        self._offset = 0
+        self._pending_offset = 0
+        if os.path.exists(self.offset_path):
+            with open(self.offset_path) as f:
+                self._offset = int(f.read().strip() or 0)
+        self._pending_offset = self._offset
+
+    def _read(self, max_messages: int) -> List[dict]:
+        messages = []
+        if not os.path.exists(self.path):
+            return messages
+        if os.path.getsize(self.path) < self._pending_offset:
+            # File was truncated or rotated, start again from the top
+            self._offset = self._pending_offset = 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._pending_offset)
+            while len(messages) < max_messages:
+                line = f.readline()
+                if not line or not line.endswith(b'\n'):
+                    # Leave partially written lines for the next poll
+                    break
+                self._pending_offset += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Skipping malformed message: {str(e)}")
+                    continue
+                if isinstance(message, dict):
+                    message["source_offset"] = self._pending_offset
+                messages.append(message)
+        return messages
+
+    def poll(self, max_messages: int, timeout: float) -> List[dict]:
+        """
+        Read up to max_messages new lines, waiting at most timeout seconds for the first
+
+        Returns:
+            list: Messages in file order
+        """
+        deadline = time.monotonic() + timeout
+        messages = self._read(max_messages)
+        while not messages and time.monotonic() < deadline:
+            time.sleep(min(0.05, max(0.0, deadline - time.monotonic())))
+            messages = self._read(max_messages)
+        return messages
+
+    def seek(self, offset: int) -> bool:
+        """
+        Skip ahead to an offset already processed by the consumer and commit it
+
+        Ignored if the offset is behind the committed one or beyond the end of the
+        file (which was then truncated or rotated since the offset was recorded).
+
+        Returns:
+            bool: Whether the read position moved
+        """
+        if not os.path.exists(self.path) or not self._offset < offset <= os.path.getsize(self.path):
+            return False
+        self._pending_offset = offset
+        self.commit()
+        return True
+
+    def commit(self):
+        """Persist the offset of the last polled message"""
+        self._offset = self._pending_offset
+        tmp_path = self.offset_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(self._offset))
+        os.replace(tmp_path, self.offset_path)
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import types
+import random
+import threading
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.role = "assistant"
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str):
+        self.index = 0
+        self.message = _Message(content)
+        self.finish_reason = "stop"
+
+
+class _Completion:
+    def __init__(self, content: str, model: str):
+        self.model = model
+        self.choices = [_Choice(content)]
+
+
+class _Completions:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def create(self, model: str = "stub", messages: list = None, **kwargs):
+        """Sleep for the configured latency and return a canned answer"""
+        return self._stub.complete(model, messages or [])
+
+
+class _Chat:
+    def __init__(self, stub):
+        self.completions = _Completions(stub)
+
+
+class StubOpenAI:
+    """Local stand-in for openai.OpenAI with configurable latency and failure rate"""
+
+    latency_ms = 300.0
+    jitter_ms = 100.0
+    error_rate = 0.0
+    calls = 0
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        self.chat = _Chat(self)
+
+    def complete(self, model: str, messages: list) -> _Completion:
+        with StubOpenAI._lock:
+            StubOpenAI.calls += 1
+
+        delay = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        time.sleep(delay)
+
+        if random.random() < self.error_rate:
+            raise RuntimeError("Stub LLM backend error")
+
+        prompt = messages[-1].get("content", "") if messages else ""
+        return _Completion(f"[stub answer] {prompt[:200]}", model)
+
+
+def install(latency_ms: float = 300.0, jitter_ms: float = 100.0, error_rate: float = 0.0):
+    """
+    Route every openai.OpenAI client created afterwards to the local stub
+
+    Args:
+        latency_ms: Mean simulated completion latency
+        jitter_ms: Standard deviation of the simulated latency
+        error_rate: Fraction of completions that raise an error
+    """
+    StubOpenAI.latency_ms = latency_ms
+    StubOpenAI.jitter_ms = jitter_ms
+    StubOpenAI.error_rate = error_rate
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+
+    try:
+        import openai
+    except ImportError:
+        openai = types.ModuleType("openai")
+        sys.modules["openai"] = openai
+
+    openai.OpenAI = StubOpenAI
@@ -0,0 +1,356 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import resource
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import numpy as np
+import pandas as pd
+from load_testing import llm_stub
+
+# Replays a mix of sentiment, summarization and Q&A requests against the
+# backend functions used by app.py, ramping the number of concurrent users.
+# Streamlit serves every session from a thread of one process, so each
+# simulated user is a thread calling the same functions. Run from the root:
+#   python -m load_testing.load_test --levels 1,2,4,8 --duration 30
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "q_and_a", "FAISS_MODELS")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for the analysis backends")
+    parser.add_argument('--input-file', default=os.path.join('assignment_details', 'topical_chat_10000.csv'))
+    parser.add_argument('--mix', default="sentiment=0.5,summary=0.3,qa=0.2",
+                        help="Relative weights of each request type")
+    parser.add_argument('--levels', default="1,2,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run each level")
+    parser.add_argument('--think-time-ms', type=float, default=0.0,
+                        help="Pause between requests of one simulated user")
+    parser.add_argument('--max-p95-ms', type=float, default=None,
+                        help="Stop ramping once p95 latency exceeds this value")
+    parser.add_argument('--stub-latency-ms', type=float, default=300.0)
+    parser.add_argument('--stub-jitter-ms', type=float, default=100.0)
+    parser.add_argument('--stub-error-rate', type=float, default=0.0)
+    parser.add_argument('--model-path', default=os.environ.get("SENTIMENT_MODEL_PATH"),
+                        help="Sentiment model to serve (default: SENTIMENT_MODEL_PATH, as in app.py)")
+    parser.add_argument('--warm-caches', action='store_true',
+                        help="Keep result caches between levels instead of clearing them before each")
+    parser.add_argument('--output', default=os.path.join('load_testing', 'load_test_results.json'))
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process from /proc (Linux only)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_workload(input_file: str) -> dict:
+    """
+    Draw request payloads from the conversation dataset
+
+    Returns:
+        dict: Request type to list of payloads
+    """
+    df = pd.read_csv(input_file)
+    messages = df['message'].dropna().astype(str).tolist()
+    conversations = df.groupby('conversation_id')['message'].apply(
+        lambda m: ' '.join(m.dropna().astype(str))).tolist()
+    questions = [m for m in messages if m.strip().endswith('?') and len(m) > 20]
+
+    return {
+        "sentiment": messages,
+        "summary": conversations,
+        "qa": questions or messages,
+    }
+
+
+def build_backends(weights: dict, model_path: Optional[str] = None) -> dict:
+    """
+    Resolve the callable serving each request type, dropping unavailable ones
+
+    Args:
+        weights: Relative weights of each request type
+        model_path: Sentiment model to serve (default model if None, as in app.py)
+
+    Returns:
+        dict: Request type to callable taking a payload
+    """
+    backends = {}
+
+    if weights.get("sentiment"):
+        from sentiment_analysis.predict import predict_single_text, DEFAULT_MODEL_PATH
+        model_path = model_path or DEFAULT_MODEL_PATH
+        print(f"Sentiment model: {model_path}")
+
+        def sentiment(text):
+            result = predict_single_text(text, model_path)
+            if result[0] == "Error":
+                raise RuntimeError("Sentiment prediction returned an error")
+            return result
+
+        backends["sentiment"] = sentiment
+
+    if weights.get("summary"):
+        from summarization.summarizer import summarize_text
+
+        def summary(text):
+            return summarize_text(text, num_sentences=random.randint(1, 5))
+
+        backends["summary"] = summary
+
+    if weights.get("qa"):
+        try:
+            from q_and_a.build import load_faiss_data
+            from q_and_a.query import query_index
+
+            idx = [f for f in os.listdir(MODELS_DIR) if f.endswith('.index')][0]
+            params = idx.replace('.index', '').split('_')
+            index, chunks = load_faiss_data(int(params[1]), int(params[3]))
+
+            def qa(question):
+                return query_index(question, index, chunks)
+
+            backends["qa"] = qa
+        except Exception as e:
+            print(f"Q&A backend unavailable, excluding it from the mix: {str(e)}")
+
+    return backends
+
+
+def result_caches(backends: dict) -> dict:
+    """Result caches used by the loaded backends"""
+    caches = {}
+    if "sentiment" in backends:
+        from sentiment_analysis.predict import result_cache as sentiment_cache
+        caches["sentiment"] = sentiment_cache
+    if "summary" in backends:
+        from summarization.summarizer import result_cache as summary_cache
+        caches["summary"] = summary_cache
+    return caches
+
+
+def isolate_caches(caches: dict, directory: str):
+    """
+    Point the disk tiers at a scratch directory for the run
+
+    RESULT_CACHE_DIR may be shared with a running deployment, and clearing a
+    cache between levels deletes its disk tier.
+    """
+    for cache in caches.values():
+        if cache.disk_dir:
+            cache.disk_dir = os.path.join(directory, cache.namespace)
+
+
+def cache_counters(caches: dict) -> dict:
+    """Cumulative hit/miss counters of the result caches"""
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def cache_hit_rates(before: dict, after: dict) -> dict:
+    """Hit rate of each result cache between two cache_counters() snapshots"""
+    rates = {}
+    for name in after:
+        hits = sum(after[name][k] - before[name][k] for k in ("memory_hits", "disk_hits"))
+        lookups = hits + after[name]["misses"] - before[name]["misses"]
+        rates[name] = {"lookups": lookups, "hit_rate": hits / lookups if lookups else 0.0}
+    return rates
+
+
+def summarize_latencies(latencies: list) -> dict:
+    if not latencies:
+        return {"count": 0}
+    values = np.array(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def run_level(concurrency: int, duration: float, backends: dict, weights: dict,
+              workload: dict, think_time_ms: float, seed: int) -> dict:
+    """
+    Run closed-loop simulated users for a fixed duration
+
+    Returns:
+        dict: Latency percentiles, error rates, throughput and memory for the level
+    """
+    names = list(backends)
+    probabilities = np.array([weights[n] for n in names], dtype=float)
+    probabilities /= probabilities.sum()
+
+    records = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    rss_samples = []
+    stop_sampling = threading.Event()
+
+    def sample_memory():
+        while not stop_sampling.is_set():
+            rss_samples.append(current_rss_mb())
+            stop_sampling.wait(0.5)
+
+    def user(user_id):
+        rng = random.Random(seed + user_id)
+        np_rng = np.random.default_rng(seed + user_id)
+        while time.perf_counter() < deadline:
+            name = names[np_rng.choice(len(names), p=probabilities)]
+            payload = rng.choice(workload[name])
+            start = time.perf_counter()
+            failed = False
+            try:
+                backends[name](payload)
+            except Exception:
+                failed = True
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                records[name].append(elapsed)
+                if failed:
+                    errors[name] += 1
+            if think_time_ms:
+                time.sleep(think_time_ms / 1000)
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(user, range(concurrency)))
+    wall = time.perf_counter() - started
+    stop_sampling.set()
+    sampler.join()
+
+    all_latencies = [v for values in records.values() for v in values]
+    total_errors = sum(errors.values())
+    result = {
+        "concurrency": concurrency,
+        "wall_s": wall,
+        "requests": len(all_latencies),
+        "throughput_rps": len(all_latencies) / wall if wall else 0.0,
+        "error_rate": total_errors / len(all_latencies) if all_latencies else 0.0,
+        "overall": summarize_latencies(all_latencies),
+        "by_type": {},
+        "rss_mb_max": max(rss_samples) if rss_samples else current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    for name in names:
+        result["by_type"][name] = summarize_latencies(records[name])
+        result["by_type"][name]["error_rate"] = errors[name] / len(records[name]) if records[name] else 0.0
+    return result
+
+
+def print_level(result: dict):
+    overall = result["overall"]
+    print(f"\nConcurrency {result['concurrency']}: {result['requests']} requests, "
+          f"{result['throughput_rps']:.2f} req/s, errors {result['error_rate']:.2%}, "
+          f"RSS {result['rss_mb_max']:.0f} MB (peak {result['peak_rss_mb']:.0f} MB)")
+    if result["cache"]:
+        print("  cache hit rate " + ", ".join(f"{name} {stats['hit_rate']:.1%}"
+                                              for name, stats in result["cache"].items()))
+    if overall["count"]:
+        print(f"  overall   p50 {overall['p50_ms']:8.1f}  p95 {overall['p95_ms']:8.1f}  p99 {overall['p99_ms']:8.1f} ms")
+    for name, stats in result["by_type"].items():
+        if stats["count"]:
+            print(f"  {name:<9} p50 {stats['p50_ms']:8.1f}  p95 {stats['p95_ms']:8.1f}  p99 {stats['p99_ms']:8.1f} ms"
+                  f"  n={stats['count']}  errors {stats['error_rate']:.2%}")
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+
+    # Never call the real OpenAI backend from a load test
+    llm_stub.install(args.stub_latency_ms, args.stub_jitter_ms, args.stub_error_rate)
+
+    weights = parse_mix(args.mix)
+    print("Loading workload...")
+    workload = build_workload(args.input_file)
+    backends = build_backends(weights, args.model_path)
+    if not backends:
+        raise ValueError("No backend available for the requested mix")
+
+    model_path = None
+    if "sentiment" in backends:
+        from sentiment_analysis.predict import DEFAULT_MODEL_PATH
+        model_path = args.model_path or DEFAULT_MODEL_PATH
+
+    caches = result_caches(backends)
+    scratch_dir = tempfile.mkdtemp(prefix="load_test_cache_")
+    isolate_caches(caches, scratch_dir)
+    results = []
+    try:
+        # Warm up once per backend so model loading is not counted as latency
+        print("Warming up backends...")
+        for name, backend in backends.items():
+            try:
+                backend(workload[name][0])
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {str(e)}")
+
+        for concurrency in [int(level) for level in args.levels.split(',')]:
+            # Cold caches by default, so later levels are not flattered by earlier hits
+            if not args.warm_caches:
+                for cache in caches.values():
+                    cache.clear()
+            counters = cache_counters(caches)
+            result = run_level(concurrency, args.duration, backends, weights, workload,
+                               args.think_time_ms, args.seed)
+            result["cache"] = cache_hit_rates(counters, cache_counters(caches))
+            results.append(result)
+            print_level(result)
+
+            p95 = result["overall"].get("p95_ms")
+            if args.max_p95_ms and p95 and p95 > args.max_p95_ms:
+                print(f"\np95 latency {p95:.1f} ms exceeds {args.max_p95_ms:.1f} ms, stopping ramp")
+                break
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({
+            "mix": {name: weights[name] for name in backends},
+            "duration_s": args.duration,
+            "model_path": model_path,
+            "warm_caches": args.warm_caches,
+            "stub_llm": {"latency_ms": args.stub_latency_ms, "jitter_ms": args.stub_jitter_ms,
+                         "error_rate": args.stub_error_rate, "calls": llm_stub.StubOpenAI.calls},
+            "levels": results,
+        }, f, indent=4)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
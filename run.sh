@@ -8,10 +8,10 @@ mkdir -p q_and_a/FAISS_MODELS summarization/output
 
 # Train models and generate data
 echo "Training sentiment analysis models and generating model file."
-python sentiment_analysis/training_with_xgboost.py
+python -m sentiment_analysis.training_with_xgboost
 
 echo "Generating summarization data..."
-python summarization/main.py
+python -m summarization.main
 
 echo "Building Q and A model"
 python q_and_a/build.py
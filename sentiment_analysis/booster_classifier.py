@@ -0,0 +1,25 @@
+import numpy as np
+
+
+class BoosterClassifier:
+    def __init__(self, booster, classes=None):
+        """
+        predict_proba/predict wrapper around a multi:softprob xgboost Booster
+
+        Lets models trained with xgb.train (e.g. from external memory) be pickled
+        and served by SentimentPredictor like an XGBClassifier.
+
+        Args:
+            booster: Trained xgboost.Booster with a multi:softprob objective
+            classes: Optional class names in label order
+        """
+        self.booster = booster
+        self.classes = [str(c) for c in classes] if classes is not None else None
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities of shape (n_samples, n_classes)"""
+        return np.asarray(self.booster.inplace_predict(np.asarray(X, dtype=np.float32)))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Most likely class index for each row"""
+        return np.argmax(self.predict_proba(X), axis=1)
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class DistilledHead:
+    def __init__(self, weights: list, biases: list, classes=None):
+        """
+        Compact classifier over sentence embeddings stored as plain NumPy arrays
+
+        Args:
+            weights: Layer weight matrices; one entry for a linear head, two for an MLP
+            biases: Layer bias vectors matching weights
+            classes: Optional class names in label order
+        """
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.classes = list(classes) if classes is not None else None
+
+    @classmethod
+    def load(cls, path: str) -> "DistilledHead":
+        """Load a head saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            num_layers = int(data['num_layers'])
+            weights = [data[f'W{i}'] for i in range(num_layers)]
+            biases = [data[f'b{i}'] for i in range(num_layers)]
+            classes = data['classes'].tolist() if 'classes' in data else None
+        return cls(weights, biases, classes)
+
+    def save(self, path: str):
+        """Write the weights to an uncompressed .npz archive"""
+        arrays = {'num_layers': np.array(len(self.weights))}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = w
+            arrays[f'b{i}'] = b
+        if self.classes is not None:
+            arrays['classes'] = np.array(self.classes)
+        np.savez(path, **arrays)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the weight arrays"""
+        return sum(w.nbytes + b.nbytes for w, b in zip(self.weights, self.biases))
+
+    def logits(self, X: np.ndarray) -> np.ndarray:
+        """Forward pass up to the pre-softmax scores"""
+        h = np.asarray(X, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w + b
+            if i < last:
+                np.maximum(h, 0, out=h)
+        return h
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities, mirroring the XGBClassifier interface
+
+        Args:
+            X: Embedding matrix of shape (n_samples, embedding_dim)
+
+        Returns:
+            np.ndarray: Probabilities of shape (n_samples, n_classes)
+        """
+        z = self.logits(X)
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        z /= z.sum(axis=1, keepdims=True)
+        return z
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Most likely class index for each row"""
+        return np.argmax(self.logits(X), axis=1)
@@ -2,6 +2,43 @@ import pickle
 import os
 from sentence_transformers import SentenceTransformer
 import numpy as np
+from common.result_cache import ResultCache, file_fingerprint
+from sentiment_analysis.distilled_head import DistilledHead
+from common.dedup import encode_deduplicated
+from common.resource_manager import resource_manager
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'xgboost_all-MiniLM-L6-v2.pkl')
+TRANSFORMER_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Model version currently registered with the resource manager, per model path
+_model_versions = {}
+
+result_cache = ResultCache("sentiment")
+
+SENTIMENT_MAP = {
+    0: "Angry",
+    1: "Curious to dive deeper",
+    2: "Disgusted",
+    3: "Fearful",
+    4: "Happy",
+    5: "Neutral",
+    6: "Sad",
+    7: "Surprised"
+}
+
+def _load_model(model_path: str):
+    """Load a pickled classifier or a distilled NumPy head"""
+    if model_path.endswith('.npz'):
+        # Distilled NumPy head: predict_proba is a single matrix multiply
+        return DistilledHead.load(model_path)
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+def _model_size(model, model_path: str) -> int:
+    """Weight bytes of a distilled head, otherwise the size of the serialized model file"""
+    if isinstance(model, DistilledHead):
+        return model.nbytes
+    return os.path.getsize(model_path)
 
 class SentimentPredictor:
     def __init__(self, model_path=None):
@@ -9,16 +46,42 @@ class SentimentPredictor:
         self.current_dir = os.path.dirname(__file__)
         
         if model_path is None:
-            model_path = os.path.join(self.current_dir, 'xgboost_all-MiniLM-L6-v2.pkl')
+            model_path = DEFAULT_MODEL_PATH
+        self.model_path = model_path
+        # Deduplication report of the most recent predict_batch call
+        self.last_dedup_report = None
         
         try:
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            self.transformer = SentenceTransformer('all-MiniLM-L6-v2')
+            # Load both artifacts up front so initialization errors surface here
+            self.model
+            self.transformer
             
         except Exception as e:
             raise Exception(f"Error initializing predictor: {str(e)}")
 
+    @property
+    def model(self):
+        """Classifier, held by the resource manager and reloaded if evicted"""
+        version = file_fingerprint(self.model_path)
+        previous = _model_versions.get(self.model_path)
+        if previous is not None and previous != version:
+            # The model file changed on disk, drop the stale copy and its cached results
+            resource_manager.evict(('sentiment_model', self.model_path, previous))
+            result_cache.discard_version(previous)
+        _model_versions[self.model_path] = version
+        
+        return resource_manager.get(('sentiment_model', self.model_path, version),
+                                    lambda: _load_model(self.model_path),
+                                    name=f"Sentiment model ({os.path.basename(self.model_path)})",
+                                    size_fn=lambda model: _model_size(model, self.model_path))
+
+    @property
+    def transformer(self):
+        """Sentence encoder, held by the resource manager and reloaded if evicted"""
+        return resource_manager.get(('sentence_transformer', TRANSFORMER_MODEL_NAME),
+                                    lambda: SentenceTransformer(TRANSFORMER_MODEL_NAME),
+                                    name=f"SentenceTransformer ({TRANSFORMER_MODEL_NAME})")
+
     def predict(self, text: str) -> tuple:
         """
         Predict sentiment for given text
@@ -36,24 +99,39 @@ class SentimentPredictor:
             prediction = np.argmax(probabilities, axis=1)[0]
             confidence = np.max(probabilities)
             
-            sentiment_map = {
-                0: "Angry",
-                1: "Curious to dive deeper",
-                2: "Disgusted",
-                3: "Fearful",
-                4: "Happy",
-                5: "Neutral",
-                6: "Sad",
-                7: "Surprised"
-            }
-            
-            predicted_sentiment = sentiment_map.get(prediction, "Unknown")
+            predicted_sentiment = SENTIMENT_MAP.get(prediction, "Unknown")
             return predicted_sentiment, confidence
             
         except Exception as e:
             print(f"Error in prediction: {str(e)}")
             return "Error", 0.0
 
+    def predict_batch(self, texts: list, dedup: str = "exact") -> list:
+        """
+        Predict sentiment for many texts, encoding repeated texts only once
+        
+        The deduplication report is kept in last_dedup_report (see
+        common.dedup.format_report) rather than printed on every call.
+        
+        Args:
+            texts: Input texts to analyze
+            dedup: "none", "exact" or "near" deduplication before encoding
+            
+        Returns:
+            list: (predicted_sentiment, confidence_score) for every text
+        """
+        try:
+            embeddings, self.last_dedup_report = encode_deduplicated(self.transformer, list(texts), dedup)
+            probabilities = self.model.predict_proba(embeddings)
+            
+            predictions = np.argmax(probabilities, axis=1)
+            confidences = np.max(probabilities, axis=1)
+            return [(SENTIMENT_MAP.get(p, "Unknown"), c) for p, c in zip(predictions, confidences)]
+            
+        except Exception as e:
+            print(f"Error in batch prediction: {str(e)}")
+            return [("Error", 0.0)] * len(texts)
+
 def predict_single_text(text: str, model_path=None) -> tuple:
     """
     Wrapper function for sentiment prediction
@@ -65,13 +143,25 @@ def predict_single_text(text: str, model_path=None) -> tuple:
     Returns:
         tuple: (predicted_sentiment, confidence_score)
     """
-    try:
+    model_path = model_path or DEFAULT_MODEL_PATH
+
+    def compute():
         predictor = SentimentPredictor(model_path)
         return predictor.predict(text)
+
+    try:
+        # Results are keyed by the model contents, so retraining invalidates them
+        version = file_fingerprint(model_path)
+        return result_cache.get_or_compute(text, version, compute,
+                                           cacheable=lambda result: result[0] != "Error")
     except Exception as e:
         print(f"Error in sentiment prediction: {str(e)}")
         return "Error", 0.0
 
+def cache_stats() -> dict:
+    """Hit/miss statistics of the sentiment result cache"""
+    return result_cache.stats()
+
 if __name__ == "__main__":
     text = input("Enter text to analyze sentiment: ")
     sentiment, confidence = predict_single_text(text)
@@ -0,0 +1,258 @@
+import os
+import argparse
+import sys
+import pickle
+import time
+import subprocess
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import classification_report, accuracy_score
+from sentence_transformers import SentenceTransformer
+from sentiment_analysis.distilled_head import DistilledHead
+from common.dedup import DEDUP_MODES, encode_deduplicated, format_report
+
+# Distils the XGBoost sentiment model into a linear or small-MLP head on the
+# MiniLM embeddings. Run from the project root after training_with_xgboost.py:
+#   python -m sentiment_analysis.training_with_distillation --hidden-units 64
+
+SENTIMENT_DATA_PATH = "sentiment_analysis"
+MODEL_NAME = 'all-MiniLM-L6-v2'
+TEACHER_FILENAME = f'xgboost_{MODEL_NAME}.pkl'
+LABEL_ENCODER_FILENAME = f'xgboost_{MODEL_NAME}_label_encoder.pkl'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Distil the XGBoost sentiment model into a NumPy head")
+    parser.add_argument('--input-file', default=os.path.join('assignment_details', 'topical_chat_10000.csv'))
+    parser.add_argument('--hidden-units', type=int, default=0,
+                        help="Hidden layer width; 0 trains a linear (softmax regression) head")
+    parser.add_argument('--epochs', type=int, default=60)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--learning-rate', type=float, default=1e-2)
+    parser.add_argument('--weight-decay', type=float, default=1e-4)
+    parser.add_argument('--temperature', type=float, default=2.0,
+                        help="Softening applied to the teacher probabilities")
+    parser.add_argument('--alpha', type=float, default=0.7,
+                        help="Weight of the teacher targets versus the true labels")
+    parser.add_argument('--dedup', choices=DEDUP_MODES, default='none',
+                        help="Collapse exact or near-duplicate messages before encoding")
+    return parser.parse_args()
+
+
+def soften(probabilities, temperature):
+    """Raise teacher probabilities to 1/T and renormalise"""
+    p = np.power(np.clip(probabilities, 1e-8, 1.0), 1.0 / temperature)
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def train_head(X, targets, hidden_units, epochs, batch_size, learning_rate, weight_decay, temperature):
+    """
+    Fit a head to soft targets with mini-batch Adam on the cross-entropy loss
+
+    Returns:
+        DistilledHead: The trained head
+    """
+    rng = np.random.default_rng(42)
+    n_features, n_classes = X.shape[1], targets.shape[1]
+
+    sizes = [n_features, hidden_units, n_classes] if hidden_units else [n_features, n_classes]
+    params = []
+    for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+        params.append(rng.normal(0, np.sqrt(2.0 / fan_in), (fan_in, fan_out)).astype(np.float32))
+        params.append(np.zeros(fan_out, dtype=np.float32))
+
+    m = [np.zeros_like(p) for p in params]
+    v = [np.zeros_like(p) for p in params]
+    beta1, beta2, eps, step = 0.9, 0.999, 1e-8, 0
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(X))
+        epoch_loss = 0.0
+        for start in range(0, len(X), batch_size):
+            idx = order[start:start + batch_size]
+            xb, tb = X[idx], targets[idx]
+
+            # Forward
+            activations = [xb]
+            h = xb
+            for layer in range(0, len(params), 2):
+                h = h @ params[layer] + params[layer + 1]
+                if layer + 2 < len(params):
+                    h = np.maximum(h, 0)
+                activations.append(h)
+            z = activations[-1] / temperature
+            z = z - z.max(axis=1, keepdims=True)
+            probs = np.exp(z)
+            probs /= probs.sum(axis=1, keepdims=True)
+            epoch_loss -= np.sum(tb * np.log(probs + 1e-12))
+
+            # Backward
+            grads = [None] * len(params)
+            delta = (probs - tb) / (temperature * len(xb))
+            for layer in range(len(params) - 2, -1, -2):
+                a_in = activations[layer // 2]
+                grads[layer] = a_in.T @ delta + weight_decay * params[layer]
+                grads[layer + 1] = delta.sum(axis=0)
+                if layer > 0:
+                    delta = (delta @ params[layer].T) * (a_in > 0)
+
+            # Adam update
+            step += 1
+            for i, g in enumerate(grads):
+                m[i] = beta1 * m[i] + (1 - beta1) * g
+                v[i] = beta2 * v[i] + (1 - beta2) * g * g
+                m_hat = m[i] / (1 - beta1 ** step)
+                v_hat = v[i] / (1 - beta2 ** step)
+                params[i] -= (learning_rate * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+
+        if (epoch + 1) % 10 == 0:
+            print(f"Epoch {epoch + 1}/{epochs} - loss {epoch_loss / len(X):.4f}")
+
+    return DistilledHead(params[0::2], params[1::2])
+
+
+def measure_latency(model, X, repeats=200):
+    """Median single-row predict_proba latency in milliseconds"""
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+# Loads one model file in a fresh interpreter and prints the RSS growth, so
+# memory freed by training in this process is not reused by the load
+_LOAD_MEMORY_SCRIPT = """
+import sys, pickle
+import xgboost
+from common.resource_manager import current_rss_bytes
+from sentiment_analysis.distilled_head import DistilledHead
+path = sys.argv[1]
+before = current_rss_bytes()
+if path.endswith('.npz'):
+    model = DistilledHead.load(path)
+else:
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+after = current_rss_bytes()
+print(after - before if before is not None and after is not None else '')
+"""
+
+
+def measure_load_memory(model_path: str):
+    """
+    Growth of the process RSS while loading a model file, in bytes
+
+    Unlike tracemalloc this includes native allocations such as XGBoost's trees.
+
+    Returns:
+        int or None: RSS growth, or None where it cannot be measured
+    """
+    try:
+        output = subprocess.run([sys.executable, '-c', _LOAD_MEMORY_SCRIPT, model_path],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return int(output) if output else None
+    except Exception as e:
+        print(f"Error measuring load memory of {model_path}: {str(e)}")
+        return None
+
+
+def booster_bytes(model) -> int:
+    """Serialized size of an XGBoost model's booster, close to the size of its trees in memory"""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model.booster
+    return len(booster.save_raw())
+
+
+def format_kib(size) -> str:
+    return f"{size / 1024:.1f} KiB" if size is not None else "n/a"
+
+
+def main():
+    args = parse_args()
+
+    teacher_path = os.path.join(SENTIMENT_DATA_PATH, TEACHER_FILENAME)
+    with open(teacher_path, 'rb') as f:
+        xgb_model = pickle.load(f)
+    with open(os.path.join(SENTIMENT_DATA_PATH, LABEL_ENCODER_FILENAME), 'rb') as f:
+        label_encoder = pickle.load(f)
+
+    df = pd.read_csv(args.input_file)
+    model = SentenceTransformer(MODEL_NAME)
+
+    print("Encoding messages...")
+    X, dedup_report = encode_deduplicated(model, df['message'].tolist(), args.dedup, show_progress_bar=True)
+    X = X.astype(np.float32)
+    print(format_report(dedup_report))
+    y = label_encoder.transform(df['sentiment'])
+
+    # Same split as training_with_xgboost.py so both models are scored on the same held-out rows
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    print("Computing teacher probabilities...")
+    teacher_probs = xgb_model.predict_proba(X_train)
+    one_hot = np.eye(len(label_encoder.classes_), dtype=np.float32)[y_train]
+    targets = args.alpha * soften(teacher_probs, args.temperature) + (1 - args.alpha) * one_hot
+
+    head_type = f"mlp{args.hidden_units}" if args.hidden_units else "linear"
+    print(f"Training {head_type} head...")
+    head = train_head(X_train, targets.astype(np.float32), args.hidden_units, args.epochs,
+                      args.batch_size, args.learning_rate, args.weight_decay, args.temperature)
+    head.classes = list(label_encoder.classes_)
+
+    head_filename = f'distilled_{head_type}_{MODEL_NAME}.npz'
+    head_path = os.path.join(SENTIMENT_DATA_PATH, head_filename)
+    head.save(head_path)
+
+    # Compare against the teacher
+    xgb_pred = xgb_model.predict(X_test)
+    head_pred = head.predict(X_test)
+    xgb_accuracy = accuracy_score(y_test, xgb_pred)
+    head_accuracy = accuracy_score(y_test, head_pred)
+    agreement = float(np.mean(xgb_pred == head_pred))
+
+    xgb_p50, xgb_p95 = measure_latency(xgb_model, X_test)
+    head_p50, head_p95 = measure_latency(head, X_test)
+
+    xgb_memory = measure_load_memory(teacher_path)
+    head_memory = measure_load_memory(head_path)
+
+    report = f"""Distilled Sentiment Head Report
+=======================
+
+Head: {head_type} ({head_filename})
+Teacher: {TEACHER_FILENAME}
+Temperature: {args.temperature}, alpha: {args.alpha}, epochs: {args.epochs}
+
+Accuracy (held-out 20%):
+- XGBoost: {xgb_accuracy:.4f}
+- Distilled head: {head_accuracy:.4f}
+- Agreement with XGBoost: {agreement:.4f}
+
+Single-text predict_proba latency (ms, p50 / p95):
+- XGBoost: {xgb_p50:.3f} / {xgb_p95:.3f}
+- Distilled head: {head_p50:.3f} / {head_p95:.3f}
+
+Memory (model size: XGBoost booster serialized with save_raw vs. head weight arrays;
+RSS growth: resident memory added by loading the file in a fresh interpreter, Python and native):
+- XGBoost pickle on disk: {format_kib(os.path.getsize(teacher_path))}
+- XGBoost model size: {format_kib(booster_bytes(xgb_model))}
+- XGBoost RSS growth while loading: {format_kib(xgb_memory)}
+- Distilled head on disk: {format_kib(os.path.getsize(head_path))}
+- Distilled head model size: {format_kib(head.nbytes)}
+- Distilled head RSS growth while loading: {format_kib(head_memory)}
+
+Distilled head classification report:
+{classification_report(y_test, head_pred, target_names=label_encoder.classes_)}
+"""
+    print(report)
+    with open(os.path.join(SENTIMENT_DATA_PATH, 'distillation_report.txt'), 'w') as f:
+        f.write(report)
+
+    print(f"Distilled head saved as: {head_filename}")
+
+
+if __name__ == "__main__":
+    main()
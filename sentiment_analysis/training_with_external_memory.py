@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import resource
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import classification_report, accuracy_score
+from sklearn.preprocessing import LabelEncoder
+from sentiment_analysis.booster_classifier import BoosterClassifier
+from common.dedup import DEDUP_MODES, encode_deduplicated, format_report
+
+# Trains the XGBoost sentiment model without holding the embedding matrix in
+# RAM. Messages are read from the CSV in chunks, encoded and written to .npy
+# shards, which are streamed into an external-memory DMatrix and trained with
+# the hist tree method. Run from the project root:
+#   python -m sentiment_analysis.training_with_external_memory --input-file topical_chat.csv
+
+SENTIMENT_DATA_PATH = "sentiment_analysis"
+MODEL_NAME = 'all-MiniLM-L6-v2'
+ALGO = 'xgboost_extmem'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="External-memory XGBoost sentiment training")
+    parser.add_argument('--input-file', default=os.path.join('assignment_details', 'topical_chat_10000.csv'))
+    parser.add_argument('--work-dir', default=os.path.join(SENTIMENT_DATA_PATH, 'external_memory'),
+                        help="Directory for embedding shards and the XGBoost page cache")
+    parser.add_argument('--csv-chunk-size', type=int, default=20000, help="Messages encoded per shard")
+    parser.add_argument('--encode-batch-size', type=int, default=256)
+    parser.add_argument('--skip-encoding', action='store_true',
+                        help="Reuse the shards already in --work-dir")
+    parser.add_argument('--dedup', choices=DEDUP_MODES, default='none',
+                        help="Collapse exact or near-duplicate messages within each shard before encoding")
+    parser.add_argument('--test-fraction', type=float, default=0.2)
+    parser.add_argument('--nthread', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--num-boost-round', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=6)
+    parser.add_argument('--learning-rate', type=float, default=0.1)
+    parser.add_argument('--max-bin', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class ShardIterator(xgb.DataIter):
+    def __init__(self, shards: list, cache_prefix: str):
+        """
+        Feed embedding shards to XGBoost one at a time
+
+        Args:
+            shards: List of (features_path, labels_path) .npy pairs
+            cache_prefix: Path prefix for XGBoost's on-disk page cache
+        """
+        self._shards = shards
+        self._position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._position == len(self._shards):
+            return False
+        features_path, labels_path = self._shards[self._position]
+        input_data(data=np.load(features_path, mmap_mode='r'), label=np.load(labels_path))
+        self._position += 1
+        return True
+
+    def reset(self):
+        self._position = 0
+
+
+def collect_classes(input_file: str, chunk_size: int) -> list:
+    """Distinct sentiment labels, read one chunk at a time"""
+    classes = set()
+    for chunk in pd.read_csv(input_file, usecols=['sentiment'], chunksize=chunk_size):
+        classes.update(chunk['sentiment'].dropna().unique())
+    return sorted(classes)
+
+
+def encode_to_shards(args, label_encoder: LabelEncoder) -> dict:
+    """
+    Encode the CSV chunk by chunk into train/test embedding shards
+
+    Returns:
+        dict: Manifest with shard paths and row counts
+    """
+    from sentence_transformers import SentenceTransformer
+
+    encoder = SentenceTransformer(MODEL_NAME)
+    rng = np.random.default_rng(args.seed)
+    shard_dir = os.path.join(args.work_dir, 'shards')
+    os.makedirs(shard_dir, exist_ok=True)
+
+    manifest = {"classes": list(label_encoder.classes_), "train": [], "test": [], "rows": 0, "encoded": 0}
+    for i, chunk in enumerate(pd.read_csv(args.input_file, usecols=['message', 'sentiment'],
+                                          chunksize=args.csv_chunk_size)):
+        chunk = chunk.dropna(subset=['sentiment'])
+        embeddings, report = encode_deduplicated(encoder, chunk['message'].astype(str).tolist(), args.dedup,
+                                                 batch_size=args.encode_batch_size)
+        embeddings = embeddings.astype(np.float32)
+        labels = label_encoder.transform(chunk['sentiment']).astype(np.float32)
+        is_test = rng.random(len(chunk)) < args.test_fraction
+
+        for split, mask in (("train", ~is_test), ("test", is_test)):
+            if not mask.any():
+                continue
+            features_path = os.path.join(shard_dir, f'{split}_{i:05d}_X.npy')
+            labels_path = os.path.join(shard_dir, f'{split}_{i:05d}_y.npy')
+            np.save(features_path, embeddings[mask])
+            np.save(labels_path, labels[mask])
+            manifest[split].append([features_path, labels_path])
+
+        manifest["rows"] += len(chunk)
+        manifest["encoded"] += report["encoded"]
+        print(f"Shard {i}: {manifest['rows']} rows encoded so far - {format_report(report)}")
+
+    with open(os.path.join(args.work_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def evaluate(model: BoosterClassifier, shards: list) -> tuple:
+    """Predict the test shards one at a time"""
+    y_true, y_pred = [], []
+    for features_path, labels_path in shards:
+        y_true.append(np.load(labels_path).astype(int))
+        y_pred.append(model.predict(np.load(features_path, mmap_mode='r')))
+    return np.concatenate(y_true), np.concatenate(y_pred)
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.work_dir, exist_ok=True)
+    timings = {}
+
+    start = time.perf_counter()
+    if args.skip_encoding:
+        print("Reusing existing embedding shards...")
+        with open(os.path.join(args.work_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+        label_encoder = LabelEncoder().fit(manifest["classes"])
+    else:
+        print("Collecting labels...")
+        label_encoder = LabelEncoder().fit(collect_classes(args.input_file, args.csv_chunk_size))
+        print("Encoding messages to shards...")
+        manifest = encode_to_shards(args, label_encoder)
+    timings["encode"] = time.perf_counter() - start
+    rss_after_encode = peak_rss_mb()
+
+    print("Building external-memory DMatrix...")
+    start = time.perf_counter()
+    train_iter = ShardIterator(manifest["train"], os.path.join(args.work_dir, 'cache', 'train'))
+    os.makedirs(os.path.join(args.work_dir, 'cache'), exist_ok=True)
+    if hasattr(xgb, 'ExtMemQuantileDMatrix'):
+        dtrain = xgb.ExtMemQuantileDMatrix(train_iter, max_bin=args.max_bin, nthread=args.nthread)
+    else:
+        dtrain = xgb.DMatrix(train_iter, nthread=args.nthread)
+    timings["dmatrix"] = time.perf_counter() - start
+
+    print("Training XGBoost model...")
+    params = {
+        'objective': 'multi:softprob',
+        'num_class': len(label_encoder.classes_),
+        'tree_method': 'hist',
+        'max_bin': args.max_bin,
+        'learning_rate': args.learning_rate,
+        'max_depth': args.max_depth,
+        'nthread': args.nthread,
+        'seed': args.seed,
+    }
+    start = time.perf_counter()
+    booster = xgb.train(params, dtrain, num_boost_round=args.num_boost_round,
+                        evals=[(dtrain, 'train')], verbose_eval=10)
+    timings["train"] = time.perf_counter() - start
+    rss_after_train = peak_rss_mb()
+
+    model = BoosterClassifier(booster, label_encoder.classes_)
+
+    start = time.perf_counter()
+    y_test, y_pred = evaluate(model, manifest["test"])
+    timings["evaluate"] = time.perf_counter() - start
+
+    accuracy = accuracy_score(y_test, y_pred)
+    report = classification_report(y_test, y_pred, labels=range(len(label_encoder.classes_)),
+                                   target_names=label_encoder.classes_, zero_division=0)
+
+    model_filename = f'{ALGO}_{MODEL_NAME}.pkl'
+    with open(os.path.join(SENTIMENT_DATA_PATH, model_filename), 'wb') as f:
+        pickle.dump(model, f)
+    with open(SENTIMENT_DATA_PATH + f'/{model_filename.split(".")[0]}_label_encoder.pkl', 'wb') as f:
+        pickle.dump(label_encoder, f)
+
+    summary = f"""External-Memory XGBoost Training Report
+=======================
+
+Data:
+- Input: {args.input_file}
+- Rows: {manifest['rows']} ({manifest['encoded']} encoded after '{args.dedup}' dedup)
+- Train shards: {len(manifest['train'])}, test shards: {len(manifest['test'])}
+
+Training:
+- tree_method=hist, max_bin={args.max_bin}, nthread={args.nthread}
+- num_boost_round={args.num_boost_round}, max_depth={args.max_depth}, learning_rate={args.learning_rate}
+
+Wall time (s):
+- Encoding: {timings['encode']:.1f}{' (skipped)' if args.skip_encoding else ''}
+- DMatrix construction: {timings['dmatrix']:.1f}
+- Training: {timings['train']:.1f}
+- Evaluation: {timings['evaluate']:.1f}
+- Total: {sum(timings.values()):.1f}
+
+Peak memory (RSS, MB):
+- After encoding: {rss_after_encode:.0f}
+- After training: {rss_after_train:.0f}
+- Overall: {peak_rss_mb():.0f}
+
+Accuracy: {accuracy:.4f}
+
+Classification Report:
+{report}
+"""
+    print(summary)
+    with open(os.path.join(SENTIMENT_DATA_PATH, 'external_memory_report.txt'), 'w') as f:
+        f.write(summary)
+
+    print(f"Model saved as: {model_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from sentence_transformers import SentenceTransformer
 import xgboost as xgb
 from sklearn.preprocessing import LabelEncoder
 import pickle
+from common.dedup import encode_deduplicated, format_report
 
 
 
@@ -14,6 +15,9 @@ SENTIMENT_DATA_PATH = "sentiment_analysis"
 
 ALGO = 'xgboost'
 
+# 'exact' or 'near' collapses repeated messages before encoding
+DEDUP_MODE = os.environ.get('DEDUP_MODE', 'none')
+
 # Load the dataset
 input_file = os.path.join('assignment_details', 'topical_chat_10000.csv')
 df = pd.read_csv(input_file)
@@ -24,7 +28,8 @@ model = SentenceTransformer(model_name)
 
 # Encode messages using SentenceTransformer
 print("Encoding messages...")
-X = model.encode(df['message'].tolist(), show_progress_bar=True)
+X, dedup_report = encode_deduplicated(model, df['message'].tolist(), DEDUP_MODE, show_progress_bar=True)
+print(format_report(dedup_report))
 
 # Convert sentiment labels to numerical values
 label_encoder = LabelEncoder()
@@ -1,67 +1,38 @@
 import os
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 from nltk.probability import FreqDist
 from heapq import nlargest
 import pandas as pd
+from summarization.tokenizer import tokenize
+from common.resource_manager import resource_manager
 
-# Explicitly set NLTK data path
-NLTK_DATA_PATH = '/Users/akilesh/nltk_data'
-nltk.data.path.append(NLTK_DATA_PATH)
-
-def simple_sentence_tokenize(text):
-    """Fallback sentence tokenizer using simple rules"""
-    # Split on common sentence endings
-    sentences = []
-    current = []
-    
-    # Split on potential sentence boundaries
-    for word in text.replace('?', '.').replace('!', '.').split('.'):
-        word = word.strip()
-        if word:
-            if not current:
-                current.append(word)
-            else:
-                current.append(word)
-                sentences.append(' '.join(current))
-                current = []
-    
-    if current:
-        sentences.append(' '.join(current))
-    
-    return sentences
+# NLTK data is located through the standard NLTK_DATA environment variable
 
 def summarize_text(text, num_sentences=3):
     try:
-        # Try NLTK tokenizer first
-        try:
-            sentences = sent_tokenize(text)
-        except Exception as e:
-            print(f"NLTK tokenizer failed, using simple tokenizer: {str(e)}")
-            sentences = simple_sentence_tokenize(text)
+        # Tokenize sentences and words in a single pass
+        sentences, sentence_words = tokenize(text)
         
         if not sentences:
             return "Could not generate summary: no sentences found."
         
-        # Tokenize words and remove stopwords
+        # Remove stopwords
         try:
-            stop_words = set(stopwords.words('english'))
+            stop_words = resource_manager.get(('nltk', 'stopwords', 'english'),
+                                              lambda: frozenset(stopwords.words('english')),
+                                              name="NLTK stopwords")
         except:
             # Fallback to empty set if stopwords fail to load
             stop_words = set()
         
-        # Simple word tokenization as fallback
-        word_tokens = text.lower().split()
-        word_tokens = [word for word in word_tokens if word.isalnum() and word not in stop_words]
+        word_tokens = [word for words in sentence_words for word in words if word not in stop_words]
         
         # Calculate word frequencies
         freq_dist = FreqDist(word_tokens)
         
         # Calculate sentence scores based on word frequencies
         sentence_scores = {}
-        for sentence in sentences:
-            words = sentence.lower().split()
+        for sentence, words in zip(sentences, sentence_words):
             for word in words:
                 if word in freq_dist:
                     if sentence not in sentence_scores:
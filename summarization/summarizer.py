@@ -1,21 +1,34 @@
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 from nltk.probability import FreqDist
 from heapq import nlargest
 from typing import Optional
+from common.result_cache import ResultCache
+from summarization.tokenizer import punkt_available, tokenize, word_tokens
+from common.resource_manager import resource_manager
+
+# Bump whenever the scoring logic changes so cached summaries are invalidated
+SUMMARIZER_VERSION = "2"
+
+result_cache = ResultCache("summary")
 
 class TextSummarizer:
     def __init__(self):
         """Initialize the summarizer and download required NLTK data"""
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
+        # Set when summarize() falls back to returning its input
+        self.failed = False
+        # punkt_tab is what PunktTokenizer loads on current NLTK releases
+        for resource, package in (('tokenizers/punkt', 'punkt'),
+                                  ('tokenizers/punkt_tab/english', 'punkt_tab'),
+                                  ('corpora/stopwords', 'stopwords')):
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(package)
         
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = resource_manager.get(('nltk', 'stopwords', 'english'),
+                                               lambda: frozenset(stopwords.words('english')),
+                                               name="NLTK stopwords")
     
     def preprocess_text(self, text: str) -> tuple:
         """
@@ -25,38 +38,41 @@ class TextSummarizer:
             text: Input text to preprocess
             
         Returns:
-            tuple: (sentences, word_freq) where sentences is list of sentences
-                  and word_freq is frequency distribution of words
+            tuple: (sentences, word_freq, sentence_words) where sentences is list of sentences,
+                  word_freq is frequency distribution of words and sentence_words holds
+                  the word tokens of each sentence
         """
-        # Tokenize into sentences
-        sentences = sent_tokenize(text)
+        # Tokenize sentences and words in a single pass
+        sentences, sentence_words = tokenize(text)
         
-        # Tokenize words and remove stopwords
-        word_tokens = word_tokenize(text.lower())
-        word_tokens = [word for word in word_tokens 
-                      if word.isalnum() and word not in self.stop_words]
+        # Remove stopwords
+        content_words = [word for words in sentence_words for word in words 
+                         if word not in self.stop_words]
         
         # Calculate word frequencies
-        word_freq = FreqDist(word_tokens)
+        word_freq = FreqDist(content_words)
         
-        return sentences, word_freq
+        return sentences, word_freq, sentence_words
     
-    def score_sentences(self, sentences: list, word_freq: FreqDist) -> dict:
+    def score_sentences(self, sentences: list, word_freq: FreqDist, sentence_words: Optional[list] = None) -> dict:
         """
         Score sentences based on word frequencies
         
         Args:
             sentences: List of sentences
             word_freq: Frequency distribution of words
+            sentence_words: Word tokens of each sentence (tokenized here if omitted)
             
         Returns:
             dict: Mapping of sentences to their scores
         """
         sentence_scores = {}
         
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            word_count = len([word for word in words if word.isalnum()])
+        if sentence_words is None:
+            sentence_words = [word_tokens(sentence) for sentence in sentences]
+        
+        for sentence, words in zip(sentences, sentence_words):
+            word_count = len(words)
             
             if word_count == 0:
                 continue
@@ -69,7 +85,8 @@ class TextSummarizer:
                         sentence_scores[sentence] += word_freq[word]
             
             # Normalize by sentence length
-            sentence_scores[sentence] = sentence_scores[sentence] / word_count
+            if sentence in sentence_scores:
+                sentence_scores[sentence] = sentence_scores[sentence] / word_count
             
         return sentence_scores
     
@@ -91,13 +108,13 @@ class TextSummarizer:
                 raise ValueError("Input must be a non-empty string")
             
             # Preprocess text
-            sentences, word_freq = self.preprocess_text(text)
+            sentences, word_freq, sentence_words = self.preprocess_text(text)
             
             if len(sentences) == 0:
                 return text
             
             # Score sentences
-            sentence_scores = self.score_sentences(sentences, word_freq)
+            sentence_scores = self.score_sentences(sentences, word_freq, sentence_words)
             
             # Determine number of sentences for summary
             if num_sentences is None:
@@ -121,6 +138,7 @@ class TextSummarizer:
             
         except Exception as e:
             print(f"Error in summarization: {str(e)}")
+            self.failed = True
             return text
 
 def summarize_text(text: str, num_sentences: Optional[int] = None, ratio: Optional[float] = None) -> str:
@@ -135,8 +153,25 @@ def summarize_text(text: str, num_sentences: Optional[int] = None, ratio: Option
     Returns:
         str: Summarized text
     """
-    summarizer = TextSummarizer()
-    return summarizer.summarize(text, num_sentences, ratio)
+    if not text or not isinstance(text, str):
+        return TextSummarizer().summarize(text, num_sentences, ratio)
+
+    state = {"cacheable": False}
+
+    def compute():
+        summarizer = TextSummarizer()
+        summary = summarizer.summarize(text, num_sentences, ratio)
+        # Do not persist the raw-text fallback or sentences split without Punkt
+        state["cacheable"] = not summarizer.failed and punkt_available()
+        return summary
+
+    return result_cache.get_or_compute(text, SUMMARIZER_VERSION, compute,
+                                       cacheable=lambda summary: state["cacheable"],
+                                       num_sentences=num_sentences, ratio=ratio)
+
+def cache_stats() -> dict:
+    """Hit/miss statistics of the summary result cache"""
+    return result_cache.stats()
 
 if __name__ == "__main__":
     # Test the summarizer
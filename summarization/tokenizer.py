@@ -0,0 +1,325 @@
+import re
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from common.resource_manager import resource_manager
+
+# Shared tokenization engine for both summarizers. Sentence boundaries come
+# from NLTK's Punkt model (loaded once) or a precompiled fallback pattern, and
+# word tokens come from a single scan over each sentence. The scan reproduces
+# the alphanumeric tokens that nltk.word_tokenize would yield, without running
+# its chain of regex substitutions per call.
+
+# Alphanumeric runs, i.e. characters for which str.isalnum() is true
+_RUN_RE = re.compile(r'[^\W_]+')
+
+# Fallback sentence ends: terminal punctuation plus any closing quotes/brackets
+_SENTENCE_END_RE = re.compile(r'[.!?]+["\'”’)\]]*(?=\s|$)')
+
+# Final period of a sentence, as located by the NLTK word tokenizer
+_FINAL_PERIOD_RE = re.compile('([^\\.])(\\.)([\\]\\)}>"\'»”’ ]*)\\s*$')
+
+# Quotes that the NLTK word tokenizer treats as opening quotes
+_OPENING_QUOTE_RE = re.compile(r' (?:"|\'\')')
+
+# Characters the NLTK word tokenizer always separates from their neighbours
+_SPLIT_CHARS = frozenset('?!;@#$%&*[](){}<>"`«“‘„»”’‒–—―')
+
+# Clitics split off the preceding word ("it's" -> "it" + "'s")
+_CLITICS = ('s', 'm', 'd', 'll', 're', 've')
+
+# Words that do not split off a leading apostrophe ("'s" stays one token)
+_APOSTROPHE_WORDS = frozenset(('re', 've', 'll', 'm', 't', 's', 'd', 'n'))
+
+# Fused words separated by the tokenizer ("gonna" -> "gon" + "na")
+_FUSED_WORDS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+# Seconds before loading Punkt is retried after a failure (e.g. punkt_tab not yet downloaded)
+_PUNKT_RETRY_SECONDS = 60.0
+
+_punkt_failed_at = None
+
+
+class TokenizedText(NamedTuple):
+    sentences: List[str]
+    words: List[List[str]]
+
+
+def _read_punkt():
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer('english')
+    except ImportError:
+        import nltk
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+
+
+def _load_punkt():
+    """The Punkt sentence model, or None while NLTK data is unavailable"""
+    global _punkt_failed_at
+    if _punkt_failed_at is not None and time.monotonic() - _punkt_failed_at < _PUNKT_RETRY_SECONDS:
+        return None
+    try:
+        punkt = resource_manager.get(('nltk', 'punkt', 'english'), _read_punkt, name="NLTK Punkt model")
+    except Exception as e:
+        print(f"Punkt model unavailable, using rule-based sentence splitting "
+              f"(retrying in {_PUNKT_RETRY_SECONDS:.0f}s): {str(e)}")
+        _punkt_failed_at = time.monotonic()
+        return None
+    if _punkt_failed_at is not None:
+        print("Punkt model loaded, sentence splitting matches nltk.sent_tokenize again")
+        _punkt_failed_at = None
+    return punkt
+
+
+def punkt_available() -> bool:
+    """Whether sentences are currently split by Punkt rather than the fallback pattern"""
+    return _load_punkt() is not None
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Locate sentence boundaries
+
+    Args:
+        text: Input text
+
+    Returns:
+        list: (start, end) character offsets of each sentence
+    """
+    punkt = _load_punkt()
+    if punkt is not None:
+        return list(punkt.span_tokenize(text))
+
+    spans = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end()
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = end
+    if text[start:].strip():
+        spans.append((start, len(text)))
+
+    # Trim the whitespace separating sentences
+    trimmed = []
+    for start, end in spans:
+        while text[start].isspace():
+            start += 1
+        trimmed.append((start, end))
+    return trimmed
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+
+def _splits_before(text: str, pos: int, final_period: int) -> bool:
+    """Whether the tokenizer ends a token right before text[pos]"""
+    if pos >= len(text):
+        return True
+    c = text[pos]
+    if c.isspace() or c in _SPLIT_CHARS:
+        return True
+    nxt = text[pos + 1] if pos + 1 < len(text) else ''
+    if c in ',:':
+        return not nxt.isdigit() or nxt in ',:'
+    if c == '.':
+        return nxt == '.' or pos == final_period
+    if c == '-':
+        return nxt == '-'
+    if c == "'":
+        return nxt == '' or nxt.isspace() or nxt in _SPLIT_CHARS or nxt == "'"
+    return False
+
+
+def _left_ok(text: str, start: int, first: str) -> bool:
+    """Whether an alphanumeric run starting at start begins a token"""
+    if start == 0:
+        return True
+    c = text[start - 1]
+    if c.isspace() or c in _SPLIT_CHARS:
+        return True
+    if c in ',:':
+        if first.isdigit():
+            return False
+        # Pairs of ,/: are consumed left to right, so only an odd run splits
+        run = 1
+        while start - run - 1 >= 0 and text[start - run - 1] in ',:':
+            run += 1
+        return run % 2 == 1
+    if c == '.':
+        return start >= 2 and text[start - 2] == '.'
+    if c == '-':
+        # "--" is split left to right, so an even run leaves the word detached
+        run = 1
+        while start - run - 1 >= 0 and text[start - run - 1] == '-':
+            run += 1
+        return run % 2 == 0
+    if c == "'":
+        run = 1
+        while start - run - 1 >= 0 and text[start - run - 1] == "'":
+            run += 1
+        end = start
+        while end < len(text) and _is_word_char(text[end]):
+            end += 1
+        if text[start:end] not in _APOSTROPHE_WORDS:
+            # A leading apostrophe is split off unless it follows a word character
+            before = text[start - 2] if start >= 2 else ''
+            return run > 1 or not (before and _is_word_char(before))
+        # Otherwise only "''" pairs, consumed left to right, detach the word
+        return run % 2 == 0
+    return False
+
+
+def _right_ok(text: str, run: str, end: int, final_period: int) -> Tuple[bool, str]:
+    """
+    Whether an alphanumeric run ending at end closes a token
+
+    Returns:
+        tuple: (ok, token) where token may drop a trailing "n" of "n't"
+    """
+    if end >= len(text):
+        return True, run
+    c = text[end]
+    if c == "'":
+        j = end + 1
+        if j < len(text) and text[j] == "'":
+            return True, run
+        if _splits_before(text, j, final_period):
+            return True, run
+        for clitic in _CLITICS:
+            if text.startswith(clitic, j) and _splits_before(text, j + len(clitic), final_period):
+                return True, run
+        if run.endswith('n') and len(run) > 1 and text.startswith('t', j) \
+                and _splits_before(text, j + 1, final_period):
+            return True, run[:-1]
+        if run == 'more' and text.startswith('n', j) and \
+                (j + 1 >= len(text) or not _is_word_char(text[j + 1])):
+            return True, run
+        return False, run
+    if c in ',:':
+        nxt = text[end + 1] if end + 1 < len(text) else ''
+        return nxt == '' or not nxt.isdigit() or nxt in ',:', run
+    if c == '-':
+        return end + 1 < len(text) and text[end + 1] == '-', run
+    return _splits_before(text, end, final_period), run
+
+
+def word_tokens(sentence: str) -> List[str]:
+    """
+    Lowercased alphanumeric word tokens of a sentence in one pass
+
+    Matches [w for w in nltk.word_tokenize(sentence.lower()) if w.isalnum()].
+
+    Args:
+        sentence: A single sentence
+
+    Returns:
+        list: Word tokens in order of appearance
+    """
+    text = sentence.lower()
+    final = _FINAL_PERIOD_RE.search(text)
+    final_period = final.start(2) if final else -1
+    if final and _OPENING_QUOTE_RE.search(final.group(3)):
+        # An opening quote after the period is rewritten to `` and blocks the split
+        final_period = -1
+
+    tokens = []
+    for match in _RUN_RE.finditer(text):
+        start, end = match.span()
+        run = match.group()
+        left = _left_ok(text, start, run[0])
+        right, token = _right_ok(text, run, end, final_period)
+
+        fused = _FUSED_WORDS.get(token)
+        if fused and token == run:
+            before = text[start - 1] if start else ''
+            after = text[end] if end < len(text) else ''
+            separable = right if token == 'wanna' else not (after and _is_word_char(after))
+            if not (before and _is_word_char(before)) and separable:
+                # The split pads both parts with spaces, detaching them from neighbours
+                tokens.extend(fused)
+                continue
+
+        if left and right and token:
+            tokens.append(token)
+    return tokens
+
+
+def tokenize(text: str) -> TokenizedText:
+    """
+    Split text into sentences and per-sentence word tokens
+
+    Args:
+        text: Input text
+
+    Returns:
+        TokenizedText: Sentences (as in nltk.sent_tokenize) and their word tokens
+    """
+    sentences = [text[start:end] for start, end in sentence_spans(text)]
+    return TokenizedText(sentences, [word_tokens(sentence) for sentence in sentences])
+
+
+def check_parity(texts: List[str], use_punkt: Optional[bool] = None) -> dict:
+    """
+    Compare this engine with NLTK's sent_tokenize and word_tokenize
+
+    Args:
+        texts: Texts to compare on
+        use_punkt: Compare sentences too (default: whenever Punkt is available)
+
+    Returns:
+        dict: Counts of compared and mismatching sentences and texts, with examples
+    """
+    from nltk.tokenize import sent_tokenize, word_tokenize
+
+    if use_punkt is None:
+        use_punkt = _load_punkt() is not None
+
+    result = {"texts": 0, "sentences": 0, "sentence_mismatches": 0,
+              "word_mismatches": 0, "examples": []}
+    for text in texts:
+        result["texts"] += 1
+        if use_punkt:
+            tokenized = tokenize(text)
+            if tokenized.sentences != sent_tokenize(text):
+                result["sentence_mismatches"] += 1
+                result["examples"].append(("sentences", text))
+            sentences = tokenized.sentences
+        else:
+            sentences = [text]
+
+        for sentence in sentences:
+            result["sentences"] += 1
+            expected = [w for w in word_tokenize(sentence.lower(), preserve_line=not use_punkt)
+                        if w.isalnum()]
+            if word_tokens(sentence) != expected:
+                result["word_mismatches"] += 1
+                result["examples"].append(("words", sentence))
+    return result
+
+
+if __name__ == "__main__":
+    # Parity check against NLTK on the conversation dataset
+    import sys
+    import pandas as pd
+
+    df = pd.read_csv(sys.argv[1] if len(sys.argv) > 1 else "assignment_details/topical_chat_10000.csv")
+    messages = df['message'].dropna().astype(str).tolist()
+    conversations = df.groupby('conversation_id')['message'].apply(
+        lambda m: ' '.join(m.dropna().astype(str))).tolist()
+
+    result = check_parity(messages + conversations)
+    print(f"Compared {result['texts']} texts ({result['sentences']} sentences)")
+    print(f"Sentence mismatches: {result['sentence_mismatches']}")
+    print(f"Word token mismatches: {result['word_mismatches']}")
+    for kind, example in result["examples"][:10]:
+        print(f"- {kind}: {example!r}")
+    sys.exit(1 if result['sentence_mismatches'] or result['word_mismatches'] else 0)